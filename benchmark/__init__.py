@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  __init__.py
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# ========================================================
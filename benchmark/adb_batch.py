@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  adb_batch
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Round trips and time of one-by-one getters versus Adb.snapshot()
+# ========================================================
+import argparse
+import os
+import time
+from benchmark.fake_adb import FakeAdbServer
+
+
+def measure(fake, function, repeat):
+    requests = len(fake.requests)
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    spend = (time.perf_counter() - start_time) / repeat
+    shell_requests = [request for request in fake.requests[requests:] if request.startswith('shell:')]
+    return len(shell_requests) / repeat, spend
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare one-by-one Adb getters with Adb.snapshot().')
+    parser.add_argument('--latency', type=float, default=0.01, help='simulated seconds per adb request')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with FakeAdbServer(['emulator-5554'], latency=args.latency) as fake:
+        os.environ['ANDROID_ADB_SERVER_PORT'] = str(fake.port)
+        from public.utils.adb import Adb, SNAPSHOT_PROBES
+        adb = Adb('emulator-5554', 'socket')
+
+        # The static getters are cached in PROPERTY_CACHE, drop them before every run so
+        # both sides pay their shell round trips.
+        def one_by_one():
+            adb.invalidate_cache()
+            return {name: getattr(adb, name)() for name in SNAPSHOT_PROBES}
+
+        def snapshot():
+            adb.invalidate_cache()
+            return adb.snapshot()
+
+        assert one_by_one() == dict(snapshot())
+        for label, function in (('one by one', one_by_one), ('snapshot', snapshot)):
+            round_trips, spend = measure(fake, function, args.repeat)
+            print('{0:<12} {1:4.0f} shell round trips  {2:8.2f} ms'.format(label, round_trips, spend * 1000))
+
+
+if __name__ == '__main__':
+    main()
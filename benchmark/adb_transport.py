@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  adb_transport
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Calls per second of the socket and subprocess Adb transports
+# ========================================================
+import argparse
+import os
+import shutil
+import time
+from benchmark.fake_adb import FakeAdbServer
+
+
+def calls_per_second(adb, calls):
+    # probe() skips PROPERTY_CACHE, device_version() would time cache hits after the first call.
+    start_time = time.perf_counter()
+    for _ in range(calls):
+        adb.probe('device_version')
+    return calls / (time.perf_counter() - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the Adb socket and subprocess transports.')
+    parser.add_argument('--calls', type=int, default=200, help="probe('device_version') calls per transport")
+    args = parser.parse_args()
+
+    with FakeAdbServer(['emulator-5554']) as fake:
+        # Both the AdbClient and a real adb binary pick the server up from here.
+        os.environ['ANDROID_ADB_SERVER_PORT'] = str(fake.port)
+        from public.utils.adb import Adb
+
+        print('socket      {0:10.1f} calls/s'.format(calls_per_second(Adb('emulator-5554', 'socket'), args.calls)))
+        if shutil.which('adb'):
+            print('subprocess  {0:10.1f} calls/s'.format(
+                calls_per_second(Adb('emulator-5554', 'subprocess'), max(1, args.calls // 10))))
+        else:
+            print('subprocess  skipped, no adb binary on PATH')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  async_adb
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Throughput and latency of AsyncAdb driving many simulated devices
+# ========================================================
+import argparse
+import asyncio
+import os
+import time
+from benchmark.fake_adb import FakeAdbServer
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def drive(adb, calls, latencies):
+    for _ in range(calls):
+        start_time = time.perf_counter()
+        await adb.shell('getprop ro.build.version.release')
+        latencies.append(time.perf_counter() - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drive N simulated devices from one event loop.')
+    parser.add_argument('--devices', type=int, default=200)
+    parser.add_argument('--calls', type=int, default=20, help='shell calls per device')
+    parser.add_argument('--latency', type=float, default=0.005, help='simulated seconds per adb request')
+    args = parser.parse_args()
+
+    serials = ['emulator-{0}'.format(5554 + 2 * index) for index in range(args.devices)]
+    with FakeAdbServer(serials, latency=args.latency) as fake:
+        os.environ['ANDROID_ADB_SERVER_PORT'] = str(fake.port)
+        from public.utils.adb import AsyncAdb, HOST_CONCURRENCY
+
+        latencies = []
+        loop = asyncio.get_event_loop()
+        start_time = time.perf_counter()
+        loop.run_until_complete(asyncio.gather(
+            *[drive(AsyncAdb(serial, 'socket'), args.calls, latencies) for serial in serials]))
+        spend = time.perf_counter() - start_time
+
+    print('devices {0}, calls {1}, host concurrency {2}'.format(args.devices, len(latencies), HOST_CONCURRENCY))
+    print('throughput {0:10.1f} calls/s'.format(len(latencies) / spend))
+    print('p50        {0:10.2f} ms'.format(percentile(latencies, 0.50) * 1000))
+    print('p99        {0:10.2f} ms'.format(percentile(latencies, 0.99) * 1000))
+
+
+if __name__ == '__main__':
+    main()
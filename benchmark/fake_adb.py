@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  fake_adb
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Scripted adb server speaking the host protocol, no device needed
+# ========================================================
+import re
+import shlex
+import socket
+import socketserver
+import threading
+import time
+
+# Answer host:version with the current protocol version so a real adb binary
+# pointed at the fake server does not try to restart it.
+ADB_SERVER_VERSION = '0029'
+
+DEFAULT_RESPONSES = {
+    'getprop ro.serialno': '{serial}\n',
+    'getprop ro.build.version.release': '5.1.1\n',
+    'settings get secure android_id': '8f2c1e4d5a6b7c8d\n',
+    'wm size': 'Physical size: 1080x1920\n',
+    'netcfg': 'lo       UP                                   127.0.0.1/8   0x00000049 00:00:00:00:00:00\n'
+              'wlan0    UP                                192.168.1.23/24  0x00001043 ac:37:43:4d:12:9a\n',
+}
+
+
+class FakeDevice(object):
+
+    def __init__(self, serial, state='device', responses=None):
+        self.serial = serial
+        self.state = state
+        self.responses = dict(DEFAULT_RESPONSES)
+        self.responses.update(responses or {})
+        # Sizes of the apks streamed into 'pm install -S'.
+        self.installs = []
+
+    def run(self, command):
+        """
+        Answer one command line, enough of sh to cover ';' chains, name=$? assignments
+        and echo with $? or $name.
+
+        :Args:
+         - command: Shell command line, STR TYPE.
+        """
+        return self.execute(command)[0]
+
+    def execute(self, command, status=0):
+        output = []
+        variables = {}
+        for part in command.split(';'):
+            part = part.strip()
+            if not part:
+                continue
+            assignment = re.match(r'^(\w+)=(\S*)$', part)
+            if assignment:
+                variables[assignment.group(1)] = assignment.group(2).replace('$?', str(status))
+                continue
+            if part == 'echo' or part.startswith('echo '):
+                part = re.sub(r'\$(\w+)', lambda match: variables.get(match.group(1), ''), part.replace('$?', str(status)))
+                words = shlex.split(part)[1:]
+                output.append(' '.join(words) + '\n')
+                status = 0
+                continue
+            if part.startswith(('export ', 'stty ')):
+                status = 0
+                continue
+            response = self.responses.get(part)
+            if callable(response):
+                response = response(part)
+            if response is None:
+                output.append('/system/bin/sh: {0}: not found\n'.format(part.split()[0]))
+                status = 127
+            else:
+                output.append(response.format(serial=self.serial))
+                status = 0
+        return ''.join(output), status
+
+
+class _Handler(socketserver.BaseRequestHandler):
+
+    def setup(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _read(self, size):
+        data = b''
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def _okay(self, payload=None):
+        if payload is None:
+            self.request.sendall(b'OKAY')
+        else:
+            data = payload.encode('utf-8')
+            self.request.sendall(b'OKAY' + '{0:04x}'.format(len(data)).encode('ascii') + data)
+
+    def _fail(self, message):
+        data = message.encode('utf-8')
+        self.request.sendall(b'FAIL' + '{0:04x}'.format(len(data)).encode('ascii') + data)
+
+    def _interactive(self, device):
+        # A non-pty shell: run each line read from the socket, keep $? between lines.
+        status, pending = 0, b''
+        while True:
+            chunk = self.request.recv(65536)
+            if not chunk:
+                return
+            pending += chunk
+            while b'\n' in pending:
+                line, pending = pending.split(b'\n', 1)
+                if line.strip() == b'exit':
+                    return
+                output, status = device.execute(line.decode('utf-8'), status)
+                self.request.sendall(output.encode('utf-8'))
+
+    def _exec(self, device, command):
+        # 'pm install -S <size>' reads exactly size bytes of apk from stdin.
+        words = command.split()
+        if words[:2] == ['pm', 'install'] and '-S' in words:
+            data = self._read(int(words[words.index('-S') + 1]))
+            if data is None:
+                return
+            device.installs.append(len(data))
+            self.request.sendall(b'Success\n')
+            return
+        self.request.sendall(device.run(command).encode('utf-8'))
+
+    def _track(self, server):
+        # Push the full device list now and again after every change, like the real server.
+        version = None
+        while not server.stopped:
+            with server.changed:
+                if version == server.version:
+                    server.changed.wait(0.1)
+                    continue
+                version, devices = server.version, server.device_list()
+            data = devices.encode('utf-8')
+            try:
+                self.request.sendall('{0:04x}'.format(len(data)).encode('ascii') + data)
+            except OSError:
+                return
+
+    def handle(self):
+        server, device = self.server.fake, None
+        while True:
+            length = self._read(4)
+            if length is None:
+                return
+            service = self._read(int(length, 16)).decode('utf-8')
+            server.requests.append(service)
+            if server.latency:
+                time.sleep(server.latency)
+
+            if service.startswith('host-serial:'):
+                serial, _, service = service[len('host-serial:'):].partition(':')
+                device = server.devices.get(serial)
+                if device is None:
+                    return self._fail("device '{0}' not found".format(serial))
+                service = 'host:' + service
+
+            if service == 'host:version':
+                return self._okay(ADB_SERVER_VERSION)
+            if service in ('host:features', 'host:host-features'):
+                return self._okay('')
+            if service in ('host:devices', 'host:devices-l'):
+                return self._okay(server.device_list())
+            if service == 'host:track-devices':
+                self._okay()
+                return self._track(server)
+            if service == 'host:kill':
+                return self._okay()
+            if service in ('host:transport-any', 'host:get-state', 'host:get-serialno') and device is None:
+                device = next(iter(server.devices.values()), None)
+                if device is None:
+                    return self._fail('no devices/emulators found')
+            if service == 'host:get-state':
+                return self._okay(device.state)
+            if service == 'host:get-serialno':
+                return self._okay(device.serial)
+            if service == 'host:transport-any':
+                self._okay()
+                continue
+            if service.startswith('host:transport:'):
+                device = server.devices.get(service[len('host:transport:'):])
+                if device is None:
+                    return self._fail("device '{0}' not found".format(service[len('host:transport:'):]))
+                self._okay()
+                continue
+
+            if device is None:
+                return self._fail('unknown host service')
+            if service == 'shell:':
+                self._okay()
+                return self._interactive(device)
+            if service.startswith('shell:'):
+                self._okay()
+                self.request.sendall(device.run(service[len('shell:'):]).encode('utf-8'))
+                return
+            if service.startswith('exec:'):
+                self._okay()
+                return self._exec(device, service[len('exec:'):])
+            if service.startswith('reboot:'):
+                return self._okay()
+            return self._fail('unknown service {0}'.format(service))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+
+    allow_reuse_address = True
+    daemon_threads = True
+    # The default backlog of 5 drops connects under load and skews latencies by whole seconds.
+    request_queue_size = 1024
+
+
+class FakeAdbServer(object):
+
+    def __init__(self, devices=(), latency=0.0, host='127.0.0.1', port=0):
+        """
+        :Args:
+         - devices: FakeDevice objects or serial numbers, LIST TYPE.
+         - latency: Seconds the server waits before answering each request, FLOAT TYPE.
+         - port: TCP port, default 0 picks a free one.
+        """
+        self.latency = latency
+        self.requests = []
+        self.version = 0
+        self.changed = threading.Condition()
+        self.stopped = False
+        self.devices = {}
+        for device in devices:
+            self.add_device(device)
+        self.__server = _Server((host, port), _Handler, bind_and_activate=False)
+        self.__server.fake = self
+        self.__thread = None
+
+    @property
+    def port(self):
+        return self.__server.server_address[1]
+
+    def _notify(self):
+        # Wake every host:track-devices stream.
+        with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+
+    def add_device(self, device):
+        if not isinstance(device, FakeDevice):
+            device = FakeDevice(device)
+        self.devices[device.serial] = device
+        self._notify()
+        return device
+
+    def remove_device(self, serial):
+        self.devices.pop(serial, None)
+        self._notify()
+
+    def set_state(self, serial, state):
+        self.devices[serial].state = state
+        self._notify()
+
+    def device_list(self):
+        return ''.join('{0}\t{1}\n'.format(serial, device.state) for serial, device in self.devices.items())
+
+    def start(self):
+        self.__server.server_bind()
+        self.__server.server_activate()
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.stopped = True
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+if __name__ == '__main__':
+    with FakeAdbServer(['emulator-5554', '596cb85a'], port=5037) as fake:
+        print('Fake adb server listening on 127.0.0.1:{0}, Ctrl+C to stop'.format(fake.port))
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  import_time
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Cold import time of the framework modules, measured with python -X importtime
+# ========================================================
+import argparse
+import os
+import subprocess
+import sys
+
+# The entry points of our CLI and worker processes.
+MODULES = (
+    'config.parameters',
+    'public.common.logger',
+    'public.utils.adb',
+    'public.common.get_devices',
+    'public.base.keywords',
+)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module):
+    """
+    (self microseconds, cumulative microseconds, name) of every import a fresh
+    interpreter makes for 'import module', in the order python reports them.
+
+    :Args:
+     - module: Dotted module name, STR TYPE.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import {0}'.format(module)],
+                             cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                             universal_newlines=True)
+    if process.returncode != 0:
+        raise RuntimeError('import {0} failed:\n{1}'.format(module, process.stderr))
+    records = []
+    for line in process.stderr.splitlines():
+        # "import time:       412 |       1093 |   public.utils.adb"
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        records.append((int(own), int(cumulative), name.strip()))
+    return records
+
+
+def measure(module, repeat):
+    # The best of several runs, the others are noise from the page cache and the scheduler.
+    runs = [import_times(module) for _ in range(repeat)]
+    return min(runs, key=lambda records: records[-1][1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold import time of the framework modules.')
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5, help='heaviest imports listed per module')
+    parser.add_argument('--budget', type=float, help='exit 1 when a module takes longer, in milliseconds')
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.modules:
+        records = measure(module, args.repeat)
+        total = records[-1][1] / 1000
+        print('{0:<32} {1:8.1f} ms'.format(module, total))
+        for own, cumulative, name in sorted(records, key=lambda record: -record[0])[:args.top]:
+            print('    {0:<40} self {1:7.1f} ms  cumulative {2:7.1f} ms'.format(name, own / 1000, cumulative / 1000))
+        if args.budget is not None and total > args.budget:
+            over_budget.append(module)
+
+    if over_budget:
+        print('Over the {0} ms budget: {1}'.format(args.budget, ', '.join(over_budget)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
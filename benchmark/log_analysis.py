@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  log_analysis
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Incremental log analysis of a rotating JSON-lines stream, each record counted once
+# ========================================================
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from public.common import analyze_log, logger
+
+
+def record(number):
+    return {'time': time.time(), 'level': 'FAIL' if number % 10 == 0 else 'SUCCESS', 'device': 'rotation',
+            'msg': 'Click the element <id -> login_{0}>,  Spend 0.0{1} seconds'.format(number, number % 9 + 1),
+            'duration': float('0.0{0}'.format(number % 9 + 1))}
+
+
+def rotating(records, max_bytes, compress, scan_every):
+    """
+    Records written through a rotating stream, scanned while it rotates; the count
+    the analyzer ends with and the seconds the scans took.
+    """
+    directory = tempfile.mkdtemp()
+    stream = logger.RecordStream(os.path.join(directory, 'rotation.jsonl'), max_bytes=max_bytes,
+                                 backups=records, compress=compress)
+    analyzer = analyze_log.LogAnalyzer()
+    spent = 0.0
+    for number in range(records):
+        stream.write(json.dumps(record(number)) + '\n')
+        stream.flush()
+        if number % scan_every == 0:
+            start_time = time.perf_counter()
+            analyzer.scan(directory)
+            spent += time.perf_counter() - start_time
+    stream.close()
+    analyzer.scan(directory)
+    return analyzer, len(os.listdir(directory)), spent
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count the records of a rotating stream scanned while it rotates.')
+    parser.add_argument('--records', type=int, default=600)
+    parser.add_argument('--max-bytes', type=int, default=2000)
+    parser.add_argument('--scan-every', type=int, default=1, help='records written between two scans')
+    args = parser.parse_args()
+
+    failures = []
+    for compress in (False, True):
+        analyzer, files, spent = rotating(args.records, args.max_bytes, compress, args.scan_every)
+        failed = sum(stats.failures for stats in analyzer.actions.values())
+        print('compress {0!s:<5} {1} records in {2} files, counted {3}, failures {4}, scans {5:.2f} seconds'.format(
+            compress, args.records, files, analyzer.records, failed, spent))
+        if analyzer.records != args.records:
+            failures.append('compress {0}: counted {1} of {2} records'.format(compress, analyzer.records, args.records))
+        if failed != (args.records + 9) // 10:
+            failures.append('compress {0}: counted {1} failures'.format(compress, failed))
+
+    # While Variables.DEBUG is set the text log says DEBUG for every record, no failure rate.
+    analyzer = analyze_log.LogAnalyzer()
+    analyzer.feed(['2026-10-18-20_24_30 [DEBUG] Click the element <id -> login>,  Spend 0.1 seconds\n'])
+    rate = analyzer.report()['actions']['Click the element <>']['failure_rate']
+    if rate is not None:
+        failures.append('text log of DEBUG records has the failure rate {0}'.format(rate))
+
+    if failures:
+        print('\n'.join(failures))
+        sys.exit(1)
+    print('Every record counted once')
+
+
+if __name__ == '__main__':
+    main()
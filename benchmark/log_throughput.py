@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  log_throughput
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Messages per second of the queued logger versus the old open/swap-stdout/close path
+# ========================================================
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from termcolor import cprint
+from public.common import logger
+
+
+def legacy_log(filename, level, msg):
+    # What ColourInfo.redirected_output did for every record before the writer thread.
+    temp = sys.stdout
+    with open(filename, 'a', encoding='utf-8') as file:
+        sys.stdout = file
+        cprint(msg, logger.COLOR_INFO['default'][level])
+    sys.stdout = temp
+    cprint(msg, logger.COLOR_INFO['default'][level])
+
+
+def run_threads(threads, messages, log):
+    def worker(index):
+        for number in range(messages):
+            log('DEBUG', 'device-{0} Click element by id: login_{1}, Spend 0.0123 seconds'.format(index, number))
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    start_time = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the legacy and the queued logger.')
+    parser.add_argument('--messages', type=int, default=20000, help='messages per thread')
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+    total = args.messages * args.threads
+
+    directory = tempfile.mkdtemp()
+    console = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        legacy_file = os.path.join(directory, 'legacy.log')
+        # One thread only: the legacy path swaps sys.stdout and breaks when threads interleave.
+        legacy = run_threads(1, total, lambda level, msg: legacy_log(legacy_file, level, msg))
+
+        writer = logger.ColourInfo(os.path.join(directory, 'queued.log'))
+        start_time = time.perf_counter()
+        enqueue = run_threads(args.threads, args.messages, writer.redirected_output)
+        writer.flush()
+        drained = time.perf_counter() - start_time
+    finally:
+        sys.stdout.close()
+        sys.stdout = console
+
+    with open(os.path.join(directory, 'queued.log'), encoding='utf-8') as f:
+        written = sum(1 for _ in f)
+    print('messages {0}, threads {1}, queued records written {2}'.format(total, args.threads, written))
+    print('legacy           {0:12.0f} messages/s'.format(total / legacy))
+    print('queued, enqueue  {0:12.0f} messages/s'.format(total / enqueue))
+    print('queued, on disk  {0:12.0f} messages/s'.format(total / drained))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  page_source
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Parse and query time of page source snapshots on large generated hierarchies
+# ========================================================
+import argparse
+import random
+import time
+import xml.etree.ElementTree as ElementTree
+from public.base import page_source
+
+CLASSES = (
+    'android.widget.FrameLayout',
+    'android.widget.LinearLayout',
+    'android.widget.TextView',
+    'android.widget.ImageView',
+    'android.widget.Button',
+)
+
+
+def hierarchy(nodes, fanout=8, seed=1):
+    """
+    A UiAutomator2 style page source of about the given number of nodes, a list screen
+    of rows with ids, texts and bounds.
+
+    :Args:
+     - nodes: Node count, INT TYPE.
+     - fanout: Children per layout, INT TYPE.
+    """
+    rng = random.Random(seed)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0">']
+    count = [0]
+
+    def node(depth):
+        count[0] += 1
+        index = count[0]
+        tag = CLASSES[0] if depth < 3 else rng.choice(CLASSES)
+        top = (index * 37) % 1900
+        attributes = ('index="{0}" package="com.example" class="{1}" text="item {2}" '
+                      'resource-id="com.example:id/{3}" content-desc="" checkable="false" checked="false" '
+                      'clickable="true" enabled="true" focusable="true" focused="false" scrollable="false" '
+                      'selected="false" displayed="true" bounds="[0,{4}][1080,{5}]"').format(
+            index % fanout, tag, index, 'row_{0}'.format(index % 50), top, top + 120)
+        parts.append('<{0} {1}>'.format(tag, attributes))
+        if depth < 6:
+            for _ in range(fanout):
+                if count[0] >= nodes:
+                    break
+                node(depth + 1)
+        parts.append('</{0}>'.format(tag))
+
+    while count[0] < nodes:
+        node(0)
+    parts.append('</hierarchy>')
+    return ''.join(parts)
+
+
+def timed(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = function()
+        spent = time.perf_counter() - start_time
+        best = spent if best is None else min(best, spent)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Page source snapshot parse and query time.')
+    parser.add_argument('--nodes', type=int, default=10000)
+    parser.add_argument('--queries', type=int, default=200, help='locator queries per snapshot')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    source = hierarchy(args.nodes)
+    parse, snapshot = timed(lambda: page_source.Snapshot(source), args.repeat)
+    print('{0} nodes, {1:.1f} KB of page source'.format(len(snapshot), len(source) / 1024))
+    tree_parse, root = timed(lambda: ElementTree.fromstring(source.encode('utf-8')), args.repeat)
+    print('parse      snapshot {0:8.1f} ms   ElementTree.fromstring {1:8.1f} ms'.format(parse * 1000, tree_parse * 1000))
+
+    ids = ['row_{0}'.format(number % 50) for number in range(args.queries)]
+    texts = ['item {0}'.format(number * 7 % args.nodes + 1) for number in range(args.queries)]
+    queries = (
+        ('id', lambda: [snapshot.find('id', value) for value in ids],
+         lambda: [[node for node in root.iter() if node.get('resource-id', '').endswith(':id/' + value)]
+                  for value in ids]),
+        ('xpath text', lambda: [snapshot.find('xpath', '//*[@text="{0}"]'.format(value)) for value in texts],
+         lambda: [root.findall('.//*[@text="{0}"]'.format(value)) for value in texts]),
+        ('class', lambda: [snapshot.find('class name', CLASSES[2]) for _ in range(args.queries)],
+         lambda: [root.findall('.//' + CLASSES[2]) for _ in range(args.queries)]),
+    )
+    for name, indexed, scanned in queries:
+        indexed_time, found = timed(indexed, args.repeat)
+        scanned_time, expected = timed(scanned, args.repeat)
+        assert [len(nodes) for nodes in found] == [len(nodes) for nodes in expected], name
+        print('{0:<10} {1} queries: snapshot {2:8.2f} ms   tree scan {3:8.2f} ms'.format(
+            name, args.queries, indexed_time * 1000, scanned_time * 1000))
+
+    attributes, rows = timed(lambda: snapshot.attributes('class name', CLASSES[2], 'text', 'bounds'), args.repeat)
+    print('attributes text+bounds of {0} elements: {1:.2f} ms, one page source request instead of {2}'.format(
+        len(rows), attributes * 1000, len(rows) * 2))
+
+
+if __name__ == '__main__':
+    main()
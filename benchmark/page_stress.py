@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  page_stress
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Several fake devices driven through BasePage from concurrent threads, checked for cross-talk
+# ========================================================
+import argparse
+import collections
+import io
+import random
+import sys
+import threading
+import time
+from PIL import Image
+from public.base import keywords, screenshot
+
+# Capabilities of the fake sessions carry this prefix, every answer names its device.
+DEVICE = 'stress-{0:02d}'
+
+
+class FakeElement(object):
+
+    location = {'x': 0, 'y': 0}
+
+    size = {'width': 8, 'height': 8}
+
+    def __init__(self, driver, loc):
+        self.driver = driver
+        self.loc = loc
+
+    def is_displayed(self):
+        self.driver.execute('isElementDisplayed')
+        return True
+
+    @property
+    def text(self):
+        return self.driver.execute('getElementText')['value']
+
+    def click(self):
+        self.driver.execute('clickElement')
+        if self.driver.fail_clicks:
+            raise RuntimeError('{0}: click failed'.format(self.driver.device))
+
+    def clear(self):
+        self.driver.execute('clearElement')
+
+    def send_keys(self, value):
+        self.driver.execute('sendKeysToElement')
+        self.driver.typed.append(value)
+
+
+class FakeDriver(object):
+
+    def __init__(self, device, latency, width=16):
+        """
+        A session of one device: answers carry the device name, and every command
+        checks it is sent from the thread driving that device. Its screenshots are
+        width pixels wide, which tells the device of a saved frame.
+        """
+        self.capabilities = {'udid': device, 'platformName': 'Android'}
+        self.device = device
+        self.latency = latency
+        self.owner = None
+        self.commands = 0
+        self.foreign = 0
+        self.typed = []
+        self.fail_clicks = False
+        png = io.BytesIO()
+        Image.new('RGB', (width, 8)).save(png, format='PNG')
+        self.png = png.getvalue()
+
+    def execute(self, driver_command, params=None):
+        self.commands += 1
+        if threading.current_thread() is not self.owner:
+            self.foreign += 1
+        time.sleep(random.uniform(0, self.latency))
+        if driver_command == 'getWindowSize':
+            return {'value': {'width': 1080, 'height': 1920}}
+        return {'value': '{0}:{1}'.format(self.device, driver_command)}
+
+    def find_element(self, *loc):
+        self.execute('findElement')
+        return FakeElement(self, loc)
+
+    def get_window_size(self):
+        return self.execute('getWindowSize')['value']
+
+    def get_screenshot_as_png(self):
+        self.execute('screenshot')
+        return self.png
+
+
+def drive(device, steps, latency, failures):
+    driver = FakeDriver(device, latency)
+    driver.owner = threading.current_thread()
+    page = keywords.BasePage(driver)
+    if page.driver is not driver or page.device != device:
+        failures.append('{0}: BasePage is bound to {1}'.format(device, page.device))
+    for step in range(steps):
+        page.elements.invalidate()
+        text = page.get_text('id', 'title_{0}'.format(step % 5))
+        if not text.startswith(device + ':'):
+            failures.append('{0}: read the text {1!r}'.format(device, text))
+        page.send_keys('{0}-{1}'.format(device, step), 'id', 'input')
+        page.click('id', 'submit')
+        if keywords.BasePage(driver) is not page:
+            failures.append('{0}: BasePage(driver) returned another page'.format(device))
+    if driver.foreign:
+        failures.append('{0}: {1} commands came from another thread'.format(device, driver.foreign))
+    wrong = [value for value in driver.typed if not value.startswith(device + '-')]
+    if wrong or len(driver.typed) != steps:
+        failures.append('{0}: typed {1} values, foreign {2}'.format(device, len(driver.typed), wrong[:3]))
+    if page.commands.count != driver.commands:
+        failures.append('{0}: counted {1} round trips for {2} commands'.format(
+            device, page.commands.count, driver.commands))
+    return driver.commands
+
+
+def ring_buffer(devices, steps, latency, frames):
+    """
+    Drive the devices under one RING_BUFFER run policy, every odd device failing a
+    click at its last step. Only the frames of a failing device may be saved for it.
+    """
+    screenshot.set_capture_policy(screenshot.CapturePolicy(screenshot.RING_BUFFER, frames=frames))
+    saved = []
+    save = screenshot.save
+    # Record the saves instead of encoding every frame to disk.
+    screenshot.save = lambda image, path: saved.append((image.width, path))
+    failures = []
+
+    def worker(index):
+        device = DEVICE.format(index)
+        driver = FakeDriver(device, latency, width=16 + index)
+        driver.owner = threading.current_thread()
+        page = keywords.BasePage(driver)
+        try:
+            for step in range(steps):
+                page.get_text('id', 'title')
+                driver.fail_clicks = index % 2 == 1 and step == steps - 1
+                page.click('id', 'submit')
+            if index % 2 == 1:
+                failures.append('{0}: the click did not fail'.format(device))
+        except RuntimeError:
+            pass
+        except Exception as error:
+            failures.append('{0}: {1!r}'.format(device, error))
+
+    threads = [threading.Thread(target=worker, args=(index,), name='device-{0}'.format(index))
+               for index in range(devices)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        screenshot.save = save
+
+    written = collections.Counter()
+    for width, path in saved:
+        device = DEVICE.format(width - 16)
+        written[device] += 1
+        if (width - 16) % 2 == 0:
+            failures.append('{0}: a frame was saved though it never failed'.format(device))
+        elif device not in path:
+            failures.append('{0}: a frame was saved to {1}'.format(device, path))
+    for index in range(1, devices, 2):
+        device = DEVICE.format(index)
+        # The buffered frames and the failure screen.
+        if written[device] != frames + 1:
+            failures.append('{0}: saved {1} frames, expected {2}'.format(device, written[device], frames + 1))
+    print('ring buffer of {0} frames, {1} failing devices, {2} frames saved'.format(
+        frames, devices // 2, len(saved)))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drive fake devices concurrently and check for cross-talk.')
+    parser.add_argument('--devices', type=int, default=8)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.002, help='max seconds per fake command')
+    parser.add_argument('--frames', type=int, default=5, help='frames of the ring buffer pass')
+    args = parser.parse_args()
+
+    screenshot.set_capture_policy(screenshot.CapturePolicy(screenshot.ON_FAILURE))
+    failures = []
+    commands = collections.Counter()
+
+    def worker(index):
+        device = DEVICE.format(index)
+        try:
+            commands[device] = drive(device, args.steps, args.latency, failures)
+        except Exception as error:
+            failures.append('{0}: {1!r}'.format(device, error))
+
+    threads = [threading.Thread(target=worker, args=(index,), name='device-{0}'.format(index))
+               for index in range(args.devices)]
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    spent = time.perf_counter() - start_time
+
+    pages = keywords.BasePage.devices()
+    expected = [DEVICE.format(index) for index in range(args.devices)]
+    if not set(expected) <= set(pages):
+        failures.append('pages registered for {0}, expected {1}'.format(pages, expected))
+    print('{0} devices x {1} steps, {2} commands in {3:.2f} seconds'.format(
+        args.devices, args.steps, sum(commands.values()), spent))
+    failures.extend(ring_buffer(args.devices, min(args.steps, 50), args.latency, args.frames))
+    if failures:
+        print('Cross-talk:\n  ' + '\n  '.join(failures[:20]))
+        sys.exit(1)
+    print('No cross-talk')
+
+
+if __name__ == '__main__':
+    main()
@@ -7,7 +7,11 @@
 # Amended by     :  Null
 # Amend History  :  20180701
 # ========================================================
+import collections.abc
+import itertools
 import os
+import re
+import threading
 from config.read_config import ReadConfig
 from public.utils import time_util
 
@@ -16,17 +20,64 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 READ_CONF = ReadConfig(os.path.join(os.path.dirname(__file__), 'config.ini'))
 
 
-# DATABASE SETTING
-DATABASES = {
-    'default': {
-        'host': READ_CONF.get_data('MysqlTest', 'host'),
-        'port': int(READ_CONF.get_data('MysqlTest', 'port')),
-        'user': READ_CONF.get_data('MysqlTest', 'user'),
-        'passwd': READ_CONF.get_data('MysqlTest', 'password'),
-        'db': READ_CONF.get_data('MysqlTest', 'db'),
-        'charset': "utf8"
+class LazySettings(collections.abc.Mapping):
+
+    def __init__(self, loader):
+        """
+        A read-only settings dict built by loader() on first access, so importing
+        parameters neither reads config.ini nor touches the result directories.
+
+        :Args:
+         - loader: Returns the settings, CALLABLE TYPE.
+        """
+        self.__loader = loader
+        self.__settings = None
+        self.__lock = threading.Lock()
+
+    def __load(self):
+        settings = self.__settings
+        if settings is None:
+            with self.__lock:
+                if self.__settings is None:
+                    self.__settings = self.__loader()
+                settings = self.__settings
+        return settings
+
+    def reset(self):
+        """
+        Build the settings again on next access, such as after config.ini changed.
+        """
+        with self.__lock:
+            self.__settings = None
+
+    def __getitem__(self, key):
+        return self.__load()[key]
+
+    def __iter__(self):
+        return iter(self.__load())
+
+    def __len__(self):
+        return len(self.__load())
+
+    def __repr__(self):
+        return repr(self.__load())
+
+
+def _databases():
+    return {
+        'default': {
+            'host': READ_CONF.get_data('MysqlTest', 'host'),
+            'port': READ_CONF.get_int('MysqlTest', 'port'),
+            'user': READ_CONF.get_data('MysqlTest', 'user'),
+            'passwd': READ_CONF.get_data('MysqlTest', 'password'),
+            'db': READ_CONF.get_data('MysqlTest', 'db'),
+            'charset': "utf8"
+        }
     }
-}
+
+
+# DATABASE SETTING
+DATABASES = LazySettings(_databases)
 
 
 # 创建当前时间 日志 & 测试报告, Usage: make_directory('Case', 0)
@@ -72,12 +123,120 @@ def document_name(extension_filename: str, filename: 'default Null'='', flag: 'd
     return filename
 
 
-# EMAIL SETTING
-EMAILS = {
-    'default': {
-        'receivers': READ_CONF.get_all('EmailReceivers'),
-        'sender_name': READ_CONF.get_data('EmailSender', 'sendaddr_name'),
-        'sender_psw': READ_CONF.get_data('EmailSender', 'sendaddr_pswd'),
-        'filename': make_directory('Result', 2)
+class RunLayout(object):
+
+    # kind -> (directory under result/, file extension)
+    KINDS = {
+        'log': ('log', 'log'),
+        'html': ('report', 'html'),
+        'img': ('img', 'png'),
+    }
+
+    def __init__(self, root='result', device=None):
+        """
+        Paths of one run's logs, reports and screenshots. The result/{log,report,img}/<day>/
+        directories (plus /<device>/ for a device layout) are created once per day, after
+        that handing out a path touches no filesystem. Every file gets the run's start time
+        and a sequence number, so the newest one is known without listing the directory.
+
+        :Args:
+         - root: Directory under BASE_DIR, STR TYPE.
+         - device: Device serial number, files go to a sub directory per device, STR TYPE.
+        """
+        self.root = os.path.abspath(os.path.join(BASE_DIR, root.lower()))
+        self.device = re.sub(r'[^\w.-]', '_', device) if device else None
+        self.run = time_util.timestamp('format_now')
+        self.__day = None
+        self.__directories = {}
+        self.__sequence = itertools.count(1)
+        self.__latest = {}
+        self.__lock = threading.Lock()
+
+    def directory(self, kind):
+        """
+        Today's directory of a kind, created on the first call of the day.
+
+        :Args:
+         - kind: 'log', 'html' or 'img', STR TYPE.
+
+        :Usage:
+            run_layout().directory('img')
+        """
+        day = time_util.timestamp('format_day')
+        if day != self.__day:
+            with self.__lock:
+                if day != self.__day:
+                    directories = {}
+                    for name, (directory, _) in self.KINDS.items():
+                        path = os.path.join(self.root, directory, day)
+                        if self.device:
+                            path = os.path.join(path, self.device)
+                        os.makedirs(path, exist_ok=True)
+                        directories[name] = path
+                    self.__directories, self.__day = directories, day
+        return self.__directories[kind]
+
+    def path(self, kind, name=None):
+        """
+        A new unique file path: <directory>/<run start>-<sequence>[-name].<extension>.
+
+        :Args:
+         - kind: 'log', 'html' or 'img', STR TYPE.
+         - name: Readable part of the file name, STR TYPE.
+
+        :Usage:
+            run_layout('596cb85a').path('img', 'login')
+            -> '.../result/img/2026-10-18/596cb85a/2026-10-18-09_30_00-0007-login.png'
+        """
+        directory = self.directory(kind)
+        filename = '{0}-{1:04d}{2}.{3}'.format(
+            self.run, next(self.__sequence), '-' + name if name else '', self.KINDS[kind][1])
+        path = os.path.join(directory, filename)
+        self.__latest[kind] = path
+        return path
+
+    def latest(self, kind):
+        """
+        The last path path() handed out for a kind, None before the first one.
+
+        :Args:
+         - kind: 'log', 'html' or 'img', STR TYPE.
+        """
+        return self.__latest.get(kind)
+
+
+# device serial (None for the run itself) -> RunLayout
+_layouts = {}
+_layouts_lock = threading.Lock()
+
+
+def run_layout(device=None):
+    """
+    The RunLayout of this run, or of one device in it, created on first use.
+
+    :Args:
+     - device: Device serial number, STR TYPE.
+
+    :Usage:
+        run_layout().path('log')
+    """
+    with _layouts_lock:
+        layout = _layouts.get(device)
+        if layout is None:
+            layout = _layouts[device] = RunLayout(device=device)
+        return layout
+
+
+def _emails():
+    return {
+        'default': {
+            'receivers': READ_CONF.get_all('EmailReceivers'),
+            'sender_name': READ_CONF.get_data('EmailSender', 'sendaddr_name'),
+            'sender_psw': READ_CONF.get_data('EmailSender', 'sendaddr_pswd'),
+            'filename': run_layout().directory('html')
+        }
     }
-}
+
+
+# EMAIL SETTING
+EMAILS = LazySettings(_emails)
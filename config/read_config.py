@@ -10,21 +10,45 @@
 import configparser
 import codecs
 import os
+import threading
+import time
+import types
 
 
 class MetaSingleton(type):
 
     __instances = {}
+    __lock = threading.Lock()
 
-    def __call__(cls, *args, **kwargs):
-        if cls not in cls.__instances:
-            cls.__instances[cls] = super(MetaSingleton, cls).__call__(*args, **kwargs)
-            return cls.__instances[cls]
+    def __call__(cls, filename, *args, **kwargs):
+        # One instance per file: the same file reached by another path is the same instance.
+        key = (cls, os.path.abspath(filename))
+        with cls.__lock:
+            if key not in cls.__instances:
+                cls.__instances[key] = super(MetaSingleton, cls).__call__(filename, *args, **kwargs)
+            return cls.__instances[key]
+
+
+# Seconds between two mtime checks of the file, lookups in between are plain dict reads.
+CHECK_INTERVAL = 1.0
+
+# Marks an accessor call without a fallback.
+_MISSING = object()
 
 
 class ReadConfig(metaclass=MetaSingleton):
 
-    def __init__(self, filename, mode='a', encoding='utf-8-sig', flag=False, sections=None, options=None, value=None):
+    def __init__(self, filename, mode='a', encoding='utf-8-sig', flag=False, sections=None, options=None, value=None,
+                 check_interval=CHECK_INTERVAL):
+        """
+        The .ini file parsed once into a read-only snapshot, parsed again only when its
+        mtime changes.
+
+        :Args:
+         - filename: The .ini file, STR TYPE.
+         - flag: Write sections/options/value to the file first, BOOLEAN TYPE.
+         - check_interval: Seconds between mtime checks, 0 checks on every lookup, FLOAT TYPE.
+        """
         self.filename = os.fspath(filename)
         self.baseFilename = os.path.abspath(filename)
         self.mode = mode
@@ -33,7 +57,12 @@ class ReadConfig(metaclass=MetaSingleton):
         self.options = options
         self.value = value
         self.flag = flag
+        self.check_interval = check_interval
         self.__config__ = configparser.ConfigParser()
+        self.__lock = threading.Lock()
+        self.__snapshot = None
+        self.__mtime = None
+        self.__checked = 0.0
 
         if self.flag:
             self.__config__.add_section(self.sections)
@@ -41,18 +70,96 @@ class ReadConfig(metaclass=MetaSingleton):
             with codecs.open(self.filename, self.mode, encoding=self.encoding) as file:
                 self.__config__.write(file)
 
+    def __stat_mtime(self):
+        try:
+            return os.stat(self.filename).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload(self):
+        """
+        Parse the file now, section -> {option: value} with interpolation and DEFAULT applied.
+
+        :Usage:
+            ReadConfig(filename).reload()
+        """
+        with self.__lock:
+            mtime = self.__stat_mtime()
+            config = configparser.ConfigParser()
+            if mtime is not None:
+                with open(self.filename, encoding=self.encoding) as file:
+                    config.read_file(file)
+            self.__snapshot = types.MappingProxyType({
+                section: types.MappingProxyType(dict(config.items(section))) for section in config.sections()})
+            self.__mtime = mtime
+            self.__checked = time.monotonic()
+            return self.__snapshot
+
+    def snapshot(self):
+        """
+        The current read-only section -> {option: value} mapping.
+
+        :Usage:
+            ReadConfig(filename).snapshot()['MysqlTest']['host']
+        """
+        snapshot = self.__snapshot
+        if snapshot is None:
+            return self.reload()
+        now = time.monotonic()
+        if now - self.__checked >= self.check_interval:
+            self.__checked = now
+            if self.__stat_mtime() != self.__mtime:
+                return self.reload()
+        return snapshot
+
+    def __section(self, section):
+        try:
+            return self.snapshot()[section]
+        except KeyError:
+            raise configparser.NoSectionError(section)
+
+    def __lookup(self, section, option, fallback):
+        try:
+            return self.__section(section)[self.__config__.optionxform(option)]
+        except (KeyError, configparser.NoSectionError):
+            if fallback is not _MISSING:
+                return fallback
+            if section not in self.snapshot():
+                raise configparser.NoSectionError(section)
+            raise configparser.NoOptionError(option, section)
+
     # Read the.ini file.
-    def get_data(self, section: str, option: str) -> str:
-        self.__config__.read(self.filename)
-        return self.__config__.get(section, option)
+    def get_data(self, section: str, option: str, fallback=_MISSING) -> str:
+        return self.__lookup(section, option, fallback)
+
+    def get_int(self, section: str, option: str, fallback=_MISSING) -> int:
+        value = self.__lookup(section, option, fallback)
+        return value if value is fallback else int(value)
+
+    def get_float(self, section: str, option: str, fallback=_MISSING) -> float:
+        value = self.__lookup(section, option, fallback)
+        return value if value is fallback else float(value)
+
+    def get_boolean(self, section: str, option: str, fallback=_MISSING) -> bool:
+        value = self.__lookup(section, option, fallback)
+        if value is fallback:
+            return value
+        if value.lower() not in configparser.ConfigParser.BOOLEAN_STATES:
+            raise ValueError('Not a boolean: {0}'.format(value))
+        return configparser.ConfigParser.BOOLEAN_STATES[value.lower()]
 
     # Gets the value of all of the items in the.ini file.
     def get_all(self, section: str) -> list:
-        option_value = []
-        self.__config__.read(self.filename)
-        for option in self.__config__.options(section):
-            option_value.append(self.get_data(section, option))
-        return option_value
+        return list(self.__section(section).values())
+
+    def get_section(self, section: str) -> dict:
+        """
+        The options of a section as a read-only dict.
+
+        :Usage:
+            ReadConfig(filename).get_section('MysqlTest')['host']
+        """
+        return self.__section(section)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  element_cache
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Locator -> WebElement cache of the current screen and WebDriver round trip counters
+# ========================================================
+import collections
+import functools
+import threading
+
+
+class CommandCounter(object):
+
+    def __init__(self, driver):
+        """
+        Count the commands a driver sends. Every WebDriver and WebElement call goes
+        through driver.execute(), and each one is an HTTP round trip to the Appium server.
+
+        :Args:
+         - driver: webdriver.Remote, its execute() is wrapped once.
+
+        :Usage:
+            CommandCounter.of(driver).count
+        """
+        self.count = 0
+        self.commands = collections.Counter()
+        self.__lock = threading.Lock()
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            with self.__lock:
+                self.count += 1
+                self.commands[driver_command] += 1
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+        driver._command_counter = self
+
+    @classmethod
+    def of(cls, driver):
+        """
+        The counter of a driver, wrapping it on first use.
+        """
+        counter = getattr(driver, '_command_counter', None)
+        return counter if counter is not None else cls(driver)
+
+
+class ElementCache(object):
+
+    def __init__(self):
+        """
+        WebElements found on the current screen by locator. Actions that may leave the
+        screen invalidate() it, and a stale element is dropped and looked up again.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.__elements = {}
+
+    def get(self, loc):
+        element = self.__elements.get(loc)
+        if element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return element
+
+    def put(self, loc, element):
+        self.__elements[loc] = element
+        return element
+
+    def discard(self, loc):
+        self.__elements.pop(loc, None)
+
+    def invalidate(self):
+        self.__elements.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.__elements)}
+
+
+def action(navigates=False, mutates=False):
+    """
+    Decorate a BasePage action: record the driver round trips of the outermost action
+    in self.round_trips, and invalidate the element cache and the page source snapshot
+    afterwards when the action may change the screen.
+
+    :Args:
+     - navigates: The action may leave the current screen, BOOLEAN TYPE.
+     - mutates: The action may change what the screen shows but not its elements,
+       such as typing, only the snapshot is dropped, BOOLEAN TYPE.
+
+    :Usage:
+        @element_cache.action(navigates=True)
+        def click(self, *loc):
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            local = self._action_state
+            outermost = not getattr(local, 'depth', 0)
+            local.depth = getattr(local, 'depth', 0) + 1
+            start = self.commands.count
+            try:
+                return function(self, *args, **kwargs)
+            finally:
+                local.depth -= 1
+                if navigates:
+                    self.elements.invalidate()
+                if navigates or mutates:
+                    self.snapshots.invalidate()
+                if outermost:
+                    spent = self.commands.count - start
+                    self.last_round_trips = spent
+                    calls, total = self.round_trips.get(function.__name__, (0, 0))
+                    self.round_trips[function.__name__] = (calls + 1, total + spent)
+        return wrapper
+    return decorator
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  element_set
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Lazy collection of the elements of one locator, fetched with a single find_elements call
+# ========================================================
+from public.base import page_source
+
+
+class ElementSet(object):
+
+    def __init__(self, driver, by, value, snapshot=None):
+        """
+        Elements of one locator. Nothing is sent to the driver until the elements are
+        first used, then one find_elements call fetches them all.
+
+        :Args:
+         - driver: webdriver.Remote.
+         - by: Locator strategy, STR TYPE.
+         - value: Locator value, STR TYPE.
+         - snapshot: Callable returning the page_source.Snapshot to read attributes from,
+           default a new snapshot of the driver.
+
+        :Usage:
+            elements = ElementSet(driver, 'id', 'title')
+            elements[0].click()
+        """
+        self.driver = driver
+        self.loc = (by, value)
+        self.snapshot = snapshot or (lambda: page_source.Snapshot(driver.page_source))
+        self.__elements = None
+
+    @property
+    def fetched(self):
+        return self.__elements is not None
+
+    def _elements(self):
+        if self.__elements is None:
+            self.__elements = self.driver.find_elements(*self.loc)
+        return self.__elements
+
+    def __len__(self):
+        return len(self._elements())
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        return self._elements()[index]
+
+    def __iter__(self):
+        return iter(self._elements())
+
+    def choice(self, rng):
+        """
+        (index, element) picked at random.
+
+        :Args:
+         - rng: random.Random, seed it to pick the same elements again.
+        """
+        elements = self._elements()
+        if not elements:
+            raise IndexError('No elements match {0}'.format(self.loc))
+        index = rng.randrange(len(elements))
+        return index, elements[index]
+
+    def attributes(self, *names):
+        """
+        The attributes of every matched element, as one dict per element with the names
+        as keys and 'bounds' as (left, top, right, bottom). They are read from a single
+        page source when the locator can be evaluated on it, otherwise with a
+        get_attribute call per element and name.
+
+        :Args:
+         - names: get_attribute() names, such as 'text', 'bounds', 'resource-id'.
+
+        :Usage:
+            ElementSet(driver, 'id', 'title').attributes('text', 'bounds')
+            -> [{'text': 'Inbox', 'bounds': (0, 63, 1080, 210)}, ...]
+        """
+        nodes = self.snapshot().find(*self.loc)
+        if nodes is None or (self.fetched and len(nodes) != len(self.__elements)):
+            return [{name: self._value(name, element.get_attribute(name)) for name in names}
+                    for element in self._elements()]
+        return [{name: node.get(name) for name in names} for node in nodes]
+
+    @staticmethod
+    def _value(name, value):
+        return page_source.parse_bounds(value) if name == 'bounds' else value
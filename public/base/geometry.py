@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  geometry
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Window size of a driver cached until the screen rotates, and W3C swipe sequences
+# ========================================================
+import threading
+
+# WebDriver commands the cache follows: the size only changes when the orientation does.
+SET_ORIENTATION = 'setScreenOrientation'
+
+GET_ORIENTATION = 'getScreenOrientation'
+
+WINDOW_SIZE_COMMANDS = ('getWindowSize', 'getWindowRect')
+
+W3C_ACTIONS = 'actions'
+
+
+class ScreenGeometry(object):
+
+    def __init__(self, driver):
+        """
+        Window width and height of a driver, asked for once. Setting or reading the
+        orientation through the driver updates it, so a rotation made by the test never
+        leaves a stale size; call invalidate() after a rotation the app makes itself.
+        The size always comes from the driver: 'wm size' is the panel in its natural
+        orientation, ignoring rotation and the system bars.
+
+        :Args:
+         - driver: webdriver.Remote, its execute() is wrapped once.
+
+        :Usage:
+            width, height = ScreenGeometry.of(driver).size()
+        """
+        self.driver = driver
+        self.orientation = None
+        self.__size = None
+        self.__lock = threading.Lock()
+        execute = driver.execute
+
+        def watched_execute(driver_command, params=None):
+            response = execute(driver_command, params)
+            if driver_command == SET_ORIENTATION:
+                self.invalidate()
+            elif driver_command == GET_ORIENTATION:
+                self._orientation(response.get('value') if isinstance(response, dict) else None)
+            elif driver_command in WINDOW_SIZE_COMMANDS and isinstance(response, dict):
+                value = response.get('value') or {}
+                if 'width' in value and 'height' in value:
+                    with self.__lock:
+                        self.__size = (value['width'], value['height'])
+            return response
+
+        driver.execute = watched_execute
+        driver._screen_geometry = self
+
+    @classmethod
+    def of(cls, driver):
+        """
+        The geometry of a driver, created on first use.
+        """
+        geometry = getattr(driver, '_screen_geometry', None)
+        return geometry if geometry is not None else cls(driver)
+
+    def _orientation(self, orientation):
+        with self.__lock:
+            if orientation and self.orientation and str(orientation).upper() != self.orientation:
+                self.__size = None
+            self.orientation = str(orientation).upper() if orientation else self.orientation
+
+    def invalidate(self):
+        with self.__lock:
+            self.__size = None
+            self.orientation = None
+
+    def size(self):
+        """
+        (width, height) of the window.
+        """
+        with self.__lock:
+            if self.__size is not None:
+                return self.__size
+        window = self.driver.get_window_size()
+        size = (window['width'], window['height'])
+        with self.__lock:
+            self.__size = size
+        return size
+
+    @property
+    def width(self):
+        return self.size()[0]
+
+    @property
+    def height(self):
+        return self.size()[1]
+
+    def point(self, x, y):
+        """
+        Pixel coordinates of a point given as fractions of the window.
+
+        :Usage:
+            geometry.point(0.5, 0.25) -> (540, 480)
+        """
+        width, height = self.size()
+        return int(width * x), int(height * y)
+
+
+def swipe_actions(swipes, duration=500, pause=100):
+    """
+    The W3C actions of a touch pointer making the swipes one after another, sent with a
+    single 'actions' command.
+
+    :Args:
+     - swipes: ((start_x, start_y), (end_x, end_y)) pixel coordinates, LIST TYPE.
+     - duration: Milliseconds of each swipe, INT TYPE.
+     - pause: Milliseconds between two swipes, INT TYPE.
+
+    :Usage:
+        driver.execute(W3C_ACTIONS, swipe_actions([((540, 480), (540, 1440))] * 3))
+    """
+    actions = []
+    for (start_x, start_y), (end_x, end_y) in swipes:
+        if actions and pause:
+            actions.append({'type': 'pause', 'duration': pause})
+        actions.extend([
+            {'type': 'pointerMove', 'duration': 0, 'x': start_x, 'y': start_y, 'origin': 'viewport'},
+            {'type': 'pointerDown', 'button': 0},
+            {'type': 'pointerMove', 'duration': duration, 'x': end_x, 'y': end_y, 'origin': 'viewport'},
+            {'type': 'pointerUp', 'button': 0},
+        ])
+    return {'actions': [{'type': 'pointer', 'id': 'finger', 'parameters': {'pointerType': 'touch'},
+                         'actions': actions}]}
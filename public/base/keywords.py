@@ -11,32 +11,82 @@
 import os
 import random
 import re
+import threading
 import time
-from PIL import ImageDraw, Image
-from appium import webdriver
-from selenium.webdriver.support import expected_conditions as Ec
-from selenium.common import exceptions as Ex
-from selenium.webdriver.support.wait import WebDriverWait
+import typing
 from config import parameters
 from public.utils import adb
 from public.common import logger
+from public.base import element_cache, element_set, geometry, page_source, screenshot, session_pool, wait
 
+# PIL, Appium and Selenium take longer to import than the rest of the framework,
+# they are imported by the methods that use them.
+if typing.TYPE_CHECKING:
+    from appium import webdriver
 
-class Singleton(object):
-    def __new__(cls, *args, **kwargs):
-        if not hasattr(cls, '_the_instance'):
-            cls._the_instance = object.__new__(cls)
-        return cls._the_instance
 
+class DeviceRegistry(object):
 
-class BasePage(Singleton):
+    # (class, device) -> instance, shared by every subclass
+    _instances = {}
+    _instances_lock = threading.Lock()
 
-    def __init__(self, driver: webdriver.Remote):
-        self.driver = driver
-        self.__adb = adb.Adb()
-        self.l = logger.Logger()
+    def __new__(cls, driver=None, device=None, *args, **kwargs):
+        """
+        One instance per class and device: creating it again for the same device returns
+        the same object, devices driven from other threads get their own. The device is
+        the serial given, else the udid or deviceName of the driver capabilities, else
+        the current thread.
+        """
+        serial = device or session_pool.device_of(getattr(driver, 'capabilities', None) or {})
+        key = (cls, serial or threading.current_thread().name)
+        with DeviceRegistry._instances_lock:
+            instance = DeviceRegistry._instances.get(key)
+            if instance is None:
+                instance = DeviceRegistry._instances[key] = object.__new__(cls)
+                instance.device = key[1]
+                instance.serial = serial
+        return instance
+
+    @classmethod
+    def of(cls, device):
+        """
+        The instance of a device, None when there is none.
+        """
+        with DeviceRegistry._instances_lock:
+            return DeviceRegistry._instances.get((cls, device))
 
-    def set_again(self, driver: webdriver.Remote):
+    @classmethod
+    def release(cls, device):
+        """
+        Forget the instance of a device, such as when it is unplugged.
+        """
+        with DeviceRegistry._instances_lock:
+            return DeviceRegistry._instances.pop((cls, device), None)
+
+    @classmethod
+    def devices(cls):
+        with DeviceRegistry._instances_lock:
+            return sorted(device for page_class, device in DeviceRegistry._instances if page_class is cls)
+
+
+class BasePage(DeviceRegistry):
+
+    def __init__(self, driver: 'webdriver.Remote', device=None):
+        """
+        The page operations of one device, see DeviceRegistry.
+
+        :Args:
+         - driver: Create a new driver that will issue commands using the wire protocol.
+         - device: Device serial number, default read from the driver capabilities, STR TYPE.
+
+        :Usage:
+            BasePage(driver).click(*locator)
+        """
+        if getattr(self, 'driver', None) is not driver:
+            self.set_again(driver)
+
+    def set_again(self, driver: 'webdriver.Remote'):
         """
         Single case mode, when Dr Changes, reset.
 
@@ -44,8 +94,19 @@ class BasePage(Singleton):
          - driver: Create a new driver that will issue commands using the wire protocol.
         """
         self.driver = driver
-        self.__adb = adb.Adb()
-        self.l = logger.Logger()
+        self.__adb = adb.Adb(self.serial)
+        self.l = logger.Logger(device=self.serial)
+        self.layout = parameters.run_layout(self.serial)
+        self.commands = element_cache.CommandCounter.of(driver)
+        self.geometry = geometry.ScreenGeometry.of(driver)
+        self.elements = element_cache.ElementCache()
+        self.snapshots = page_source.SnapshotCache(driver)
+        # action name -> (calls, driver round trips), and the round trips of the last action
+        self.round_trips = {}
+        self.last_round_trips = 0
+        self._action_state = threading.local()
+        # Random element picks, repeatable with [Run] seed of config.ini.
+        self.random = random.Random(parameters.READ_CONF.get_data('Run', 'seed', None))
         return self
 
     def wait(self, seconds):
@@ -63,6 +124,7 @@ class BasePage(Singleton):
         self.l.get_logger("Recessive waiting {0} seconds, Spend {1} seconds"
                           .format(seconds, time.time()-start_time), "INFO")
 
+    @element_cache.action(navigates=True)
     def key_code(self, num):
         """
         Sends a key_code to the device.
@@ -83,6 +145,7 @@ class BasePage(Singleton):
                               .format(time.time()-start_time), "FAIL")
             raise
 
+    @element_cache.action(navigates=True)
     def long_key_code(self, num):
         """
         Long press the physical keyboard
@@ -117,6 +180,7 @@ class BasePage(Singleton):
         if arg in event_list:
             self.key_code(int(event_list[arg]))
 
+    @element_cache.action()
     def find_element(self, *loc):
         """
         Repackage the single element location method
@@ -127,30 +191,63 @@ class BasePage(Singleton):
         :Usage:
             driver.find_element(*locator)
         """
+        element = self.elements.get(loc)
+        if element is not None:
+            return element
+
+        from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+        def displayed():
+            found = self.driver.find_element(*loc)
+            return found if found.is_displayed() else None
+
         try:
-            WebDriverWait(self.driver, 10).until(lambda driver: driver.find_element(*loc).is_displayed())
-            return self.driver.find_element(*loc)
+            return self.elements.put(loc, wait.until(
+                displayed, wait.DEFAULT_TIMEOUT, key='{0} -> {1}'.format(loc[0], loc[1]),
+                ignored=(NoSuchElementException, StaleElementReferenceException),
+                message='Element <{0} -> {1}> not displayed'.format(loc[0], loc[1])))
         except Exception:
             self.l.get_logger('Please enter the correct targeting elements!', 'FAIL')
             raise
 
+    def element_operation(self, loc, operation):
+        """
+        Run operation(element) on the element of a locator, found once. When the screen
+        changed under a cached element it is looked up again and the operation retried once.
+
+        :Args:
+         - loc: Element localizer, TUPLE TYPE.
+         - operation: Called with the WebElement, CALLABLE TYPE.
+
+        :Usage:
+            driver.element_operation(locator, lambda element: element.text)
+        """
+        from selenium.common.exceptions import StaleElementReferenceException
+        try:
+            return operation(self.find_element(*loc))
+        except StaleElementReferenceException:
+            self.elements.invalidate()
+            self.snapshots.invalidate()
+            return operation(self.find_element(*loc))
+
+    @element_cache.action()
     def save_screenshot_as_picture(self, filename):
         """
-        Saves a screenshot of the current window to a PNG image file
+        Saves a screenshot of the current window to a PNG image file, the file is
+        written by a background thread.
 
         :Args:
-         - filename: filename: The full path you wish to save your screenshot to. This
-           should end with a `.png` extension.
+         - filename: Readable part of the picture name in the run's image directory, STR TYPE.
 
         :Usage:
             driver.save_screenshot_as_picture('login')
         """
         start_time = time.time()
         try:
-            image = self.driver.get_screenshot_as_file(parameters.document_name('img', filename))
+            screenshot.write(self.driver.get_screenshot_as_png(), self.layout.path('img', filename))
             self.l.get_logger("The screenshot is successful, the name of the picture is {0},  Spend {1} seconds "
                               .format(filename, time.time()-start_time), 'SUCCESS')
-            return image
+            return True
         except Exception:
             self.l.get_logger("Screenshots failed, Spend {0} seconds".format(time.time()-start_time), 'FAIL')
             raise
@@ -163,42 +260,45 @@ class BasePage(Singleton):
             driver.get_latest_picture()
         """
         start_time = time.time()
-        try:
-            dirs = os.listdir(parameters.document_name('img'))
-            if dirs is not None:
-                dirs.sort()
-                new_image = dirs[-1]
-                self.l.get_logger("Get the latest screenshot is {0}, spend {1} seconds"
-                                  .format(new_image, time.time()-start_time), 'SUCCESS')
-                return new_image
-            else:
-                self.l.get_logger("The directory {0} is empty".format(dirs), 'FAIL')
-        except FileNotFoundError:
-            raise
+        latest = self.layout.latest('img')
+        if latest is not None:
+            new_image = os.path.basename(latest)
+            self.l.get_logger("Get the latest screenshot is {0}, spend {1} seconds"
+                              .format(new_image, time.time()-start_time), 'SUCCESS')
+            return new_image
+        else:
+            self.l.get_logger("The directory {0} is empty".format(self.layout.directory('img')), 'FAIL')
 
+    @element_cache.action()
     def find_elements(self, *loc, index=None, find_way='random'):
         """
-        Repackage a set of element location methods.
+        Repackage a set of element location methods, the elements are fetched once.
 
         :Args:
          - loc: Element localizer, TUPLE TYPE
          - index: Element index, INT TYPE DEFAULT NONE
-         - find_way: Element Location Method, STR TYPE DEFAULT RANDOM
+         - find_way: 'random' for a random element, 'normal' for the element at index,
+           'all' for the lazy ElementSet of every element, STR TYPE DEFAULT RANDOM
 
         :Usage:
-            driver.find_elements(1, 'normal', *locator)
+            driver.find_elements(*locator, index=1, find_way='normal')
+            driver.find_elements(*locator, find_way='all').attributes('text', 'bounds')
         """
+        elements = element_set.ElementSet(self.driver, *loc, snapshot=self.snapshot)
+        if find_way == 'all':
+            return elements
         try:
             if find_way == 'random':
-                if len(self.driver.find_elements(*loc)) > 0:
-                    num = random.randint(1, len(self.driver.find_elements(*loc)))
-                    return self.driver.find_elements(*loc)[num]
-            else:
-                return self.driver.find_elements(*loc)[index]
+                num, element = elements.choice(self.random)
+                self.l.get_logger("Random pick {0} of {1} elements <{2} -> {3}>"
+                                  .format(num, len(elements), loc[0], loc[1]), 'INFO')
+                return element
+            return elements[index]
         except Exception:
             self.l.get_logger('No related elements are found in the interface.', 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def elements_click(self, *loc, index):
         """
         Click on one of the set of elements.
@@ -208,18 +308,19 @@ class BasePage(Singleton):
          - index: Locate a set of element index values, INT TYPE
 
         :Usage:
-            driver.elements.click(*locator, 2)
+            driver.elements_click(*locator, index=2)
         """
         start_time = time.time()
         try:
             self.l.get_logger("Click the element <{0} -> {1}>,  Spend {2} seconds"
                               .format(loc[0], loc[1], time.time() - start_time), 'SUCCESS')
-            return self.find_elements('normal', *loc)[index].click()
+            return self.find_elements(*loc, index=index, find_way='normal').click()
         except Exception:
             self.l.get_logger("Click the element <{0} -> {1}>,  Spend {2} seconds"
                               .format(loc[0], loc[1], time.time() - start_time), 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def random_click(self, *loc):
         """
         Random click on one of the elements.
@@ -256,6 +357,7 @@ class BasePage(Singleton):
         else:
             return re.sub('[\/:*?"<>|]', '-', loc[1])
 
+    @element_cache.action()
     def red_element(self, *loc):
         """
         [image processing] marking the elements of the current operation with the matrix (red).
@@ -267,16 +369,12 @@ class BasePage(Singleton):
             driver.red_element(*locator)
         """
         element = self.find_element(*loc)
-        self.save_screenshot_as_picture(self.change_element_name(*loc))
-        box = (element.location["x"], element.location["y"],
-               element.location["x"] + element.size["width"],
-               element.location["y"] + element.size["height"])
-        new_image = os.path.join(parameters.document_name('img'), self.get_latest_picture())
-        img = Image.open(new_image)
-        draw = ImageDraw.Draw(img)
-        draw.rectangle((box[0], box[1], box[2], box[3]), outline='#8B0000')
-        return img.save(new_image)
+        image = screenshot.annotate(screenshot.capture(self.driver), screenshot.element_box(element))
+        new_image = self.layout.path('img', self.change_element_name(*loc))
+        screenshot.save(image, new_image)
+        return new_image
 
+    @element_cache.action()
     def get_element_image(self, *loc):
         """
         Just truncate an image of an element and save it to the corresponding file directory.
@@ -288,15 +386,39 @@ class BasePage(Singleton):
             diver.get_element_image(*locator)
         """
         element = self.find_element(*loc)
-        self.save_screenshot_as_picture(self.change_element_name(*loc))
-        box = (element.location["x"], element.location["y"],
-               element.location["x"] + element.size["width"],
-               element.location["y"] + element.size["height"])
-        new_image = os.path.join(parameters.document_name('img'), self.get_latest_picture())
-        img = Image.open(new_image)
-        im = img.crop(box)
-        return im.save(parameters.document_name('cut_img', self.change_element_name(*loc)))
+        image = screenshot.capture(self.driver).crop(screenshot.element_box(element))
+        new_image = self.layout.path('img', 'cut-' + self.change_element_name(*loc))
+        screenshot.save(image, new_image)
+        return new_image
+
+    def capture_evidence(self, *loc, element=None):
+        """
+        Take the evidence screenshot of an action on the element, if the capture policy
+        of the run or case wants one.
+
+        :Args:
+         - loc: Element localizer, TUPLE TYPE.
+         - element: The WebElement when the action already has it.
+        """
+        policy = screenshot.current_policy()
+        if policy.wants_frame(self.device):
+            start_time = time.perf_counter()
+            element = element or self.find_element(*loc)
+            image = screenshot.annotate(screenshot.capture(self.driver), screenshot.element_box(element))
+            policy.add_frame(image, self.layout, self.change_element_name(*loc), time.perf_counter() - start_time,
+                             device=self.device)
 
+    def capture_failure(self, *loc):
+        """
+        Keep the screen of a failed action on the element, and the frames buffered before it.
+
+        :Args:
+         - loc: Element localizer, TUPLE TYPE.
+        """
+        screenshot.current_policy().on_failure(self.driver, self.layout, self.change_element_name(*loc),
+                                               device=self.device)
+
+    @element_cache.action()
     def get_text(self, *loc):
         """
         Gets the element text value.
@@ -307,17 +429,23 @@ class BasePage(Singleton):
         :Usage:
             driver.get_text(*locator)
         """
+        def get_text(element):
+            self.capture_evidence(*loc, element=element)
+            return element.text
+
         start_time = time.time()
         try:
-            self.red_element(*loc)
+            text = self.element_operation(loc, get_text)
             self.l.get_logger("Get the text <{0} -> {1}>, Spend {2} seconds"
                               .format(loc[0], loc[1], time.time() - start_time), 'SUCCESS')
-            return self.find_element(*loc).text
+            return text
         except Exception:
             self.l.get_logger("Gets the element text failed, Spend {0} seconds"
                               .format(time.time()-start_time), 'FAIL')
+            self.capture_failure(*loc)
             raise
 
+    @element_cache.action(navigates=True)
     def click(self, *loc):
         """
         Click on the element
@@ -328,16 +456,22 @@ class BasePage(Singleton):
         :Usage:
             driver.click(*locator)
         """
+        def click(element):
+            self.capture_evidence(*loc, element=element)
+            return element.click()
+
         start_time = time.time()
         try:
-            self.red_element(*loc)
+            result = self.element_operation(loc, click)
             self.l.get_logger("Click the element <{0} -> {1}>, Spend {2} seconds"
                               .format(loc[0], loc[1], time.time() - start_time), 'SUCCESS')
-            return self.find_element(*loc).click()
+            return result
         except Exception:
             self.l.get_logger("Element click failure, Spend {0} seconds".format(time.time()-start_time), 'FAIL')
+            self.capture_failure(*loc)
             raise
 
+    @element_cache.action(mutates=True)
     def send_keys(self, value, *loc, clear_first=True):
         """
         Text input
@@ -350,19 +484,25 @@ class BasePage(Singleton):
         :Usage:
             driver.send_keys('13564958080', *locator)
         """
+        def send_keys(element):
+            if clear_first:
+                element.clear()
+            self.capture_evidence(*loc, element=element)
+            return element.send_keys(value)
+
         start_time = time.time()
         try:
-            if clear_first:
-                self.find_element(*loc).clear()
-            self.red_element(*loc)
+            result = self.element_operation(loc, send_keys)
             self.l.get_logger("Clear and input text to the element <{0} -> {1}> content: {2}, Spend {3} time "
                               .format(loc[0], loc[1], value, time.time() - start_time), 'SUCCESS')
-            return self.find_element(*loc).send_keys(value)
+            return result
         except Exception:
             self.l.get_logger("Element not found, text input failed, Spend {0} seconds"
                               .format(time.time()-start_time), 'FAIL')
+            self.capture_failure(*loc)
             raise
 
+    @element_cache.action()
     def get_attribute(self, *loc, attribute):
         """
         Gets the element attribute value.
@@ -376,7 +516,7 @@ class BasePage(Singleton):
         """
         start_time = time.time()
         try:
-            attr = self.find_element(*loc).get_attribute(attribute)
+            attr = self.element_operation(loc, lambda element: element.get_attribute(attribute))
             self.l.get_logger("Gets the attribute {2} of the element <{0} -> {1} >, Spend {3} seconds"
                               .format(loc[0], loc[1], attribute, time.time() - start_time), 'SUCCESS')
             return attr
@@ -385,6 +525,7 @@ class BasePage(Singleton):
                               .format(loc[0], loc[1], attribute, time.time()-start_time), 'FAIL')
             raise
 
+    @element_cache.action()
     def text_in_element(self, loc, text, time_out=10):
         """
         Determines whether the expected text value is equal to the actual element text value.
@@ -398,20 +539,24 @@ class BasePage(Singleton):
             kw_loc = (By.ID, 'kw')
             driver.text_in_element(kw_loc, '百度')
         """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support import expected_conditions as Ec
+        condition = Ec.text_to_be_present_in_element(loc, text)
         start_time = time.time()
         try:
-            WebDriverWait(self.driver, time_out, 0.5).until(Ec.text_to_be_present_in_element(loc, text))
+            wait.until(lambda: condition(self.driver), time_out, key='text {0} -> {1}'.format(loc[0], loc[1]))
             self.l.get_logger('the text: {0} in element <{1} -> {2} >, Spend {3} seconds'
                               .format(text, loc[0], loc[1], time.time()-start_time), 'SUCCESS')
             return True
-        except TimeoutError:
+        except TimeoutException:
             self.l.get_logger('the text: {0} not in element <{1} -> {2} >, Spend {3} seconds'
                               .format(text, loc[0], loc[1], time.time()-start_time), 'FAIL')
             return False
 
     def sleep(self, seconds):
         """
-        Sets an Mandatory wait for an element to be found
+        Sets an Mandatory wait for an element to be found, cut to what is left of the
+        case budget (see wait.case_budget).
 
         :Args:
          - seconds: Amount of time to wait (in seconds)
@@ -419,9 +564,10 @@ class BasePage(Singleton):
         :Usage:
             driver.sleep(10)
         """
-        time.sleep(seconds)
+        wait.sleep(seconds)
         self.l.get_logger("Mandatory waiting {0}".format(seconds), 'INFO')
 
+    @element_cache.action(navigates=True)
     def quit(self):
         """
         Close the browser window.
@@ -433,6 +579,7 @@ class BasePage(Singleton):
         self.driver.quit()
         self.l.get_logger('Close all browser Windows, Spend {0} seconds'.format(time.time()-start_time), 'INFO')
 
+    @element_cache.action(navigates=True)
     def switch_to_h5(self, *loc):
         """
         Switch to the  H5 interface
@@ -460,6 +607,7 @@ class BasePage(Singleton):
                               .format(time.time() - start_time), 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def switch_to_native(self):
         """
         Switch to the  native page
@@ -482,6 +630,7 @@ class BasePage(Singleton):
                               .format(time.time() - start_time), 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def jquery_click(self, css):
         """
         Jquery click event
@@ -503,6 +652,7 @@ class BasePage(Singleton):
                               .format(time.time()-start_time), 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def jquery_send(self, css, value):
         """
         Jquery input event
@@ -525,6 +675,7 @@ class BasePage(Singleton):
                               .format(time.time()-start_time), 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def js(self, script):
         """
         Execute the js script
@@ -552,7 +703,7 @@ class BasePage(Singleton):
         :Usage:
             driver.get_width
         """
-        return self.driver.get_window_size()['width']
+        return self.geometry.width
 
     @property
     def get_height(self):
@@ -562,8 +713,27 @@ class BasePage(Singleton):
         :Usage:
             driver.get_height
         """
-        return self.driver.get_window_size()['height']
+        return self.geometry.height
 
+    def swipe(self, start, end, count=1, timeout=500):
+        """
+        Swipe count times between two points given as fractions of the screen, sent to
+        the driver as one W3C actions sequence.
+
+        :Args:
+         - start: (x, y) fractions of the screen width and height, TUPLE TYPE.
+         - end: (x, y) fractions of the screen width and height, TUPLE TYPE.
+         - count: Slide number, INT TYPE.
+         - timeout: Duration of each slide in milliseconds, default 500.
+
+        :Usage:
+            driver.swipe((0.5, 0.75), (0.5, 0.25), count=3)
+        """
+        swipes = [(self.geometry.point(*start), self.geometry.point(*end))] * count
+        if swipes:
+            self.driver.execute(geometry.W3C_ACTIONS, geometry.swipe_actions(swipes, timeout))
+
+    @element_cache.action(navigates=True)
     def swipe_down(self, count=1, timeout=500):
         """
         The phone screen slides down.
@@ -575,12 +745,9 @@ class BasePage(Singleton):
         :Usage:
             driver.swipe_down()
         """
-        width, height = self.get_width, self.get_height
         start_time = time.time()
         try:
-            while count:
-                self.driver.swipe(width*0.5, height*0.25, height*0.75, timeout)
-                count -= 1
+            self.swipe((0.5, 0.25), (0.5, 0.75), count, timeout)
             self.l.get_logger("The phone screen slides down {0} count, Spend {1}"
                               .format(count, time.time()-start_time), 'SUCCESS')
         except Exception:
@@ -588,6 +755,7 @@ class BasePage(Singleton):
                               .format(count, time.time()-start_time), 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def swipe_left(self, count=1, timeout=500):
         """
         The phone screen slides to the left.
@@ -599,12 +767,9 @@ class BasePage(Singleton):
         :Usage:
             driver.swipe_left()
         """
-        width, height = self.get_width, self.get_height
         start_time = time.time()
         try:
-            while count:
-                self.driver.swipe(width*0.75, height*0.5, width*0.05, timeout)
-                count -= 1
+            self.swipe((0.75, 0.5), (0.05, 0.5), count, timeout)
             self.l.get_logger("The phone screen slides left {0} count, Spend {1}"
                               .format(count, time.time()-start_time), 'SUCCESS')
         except Exception:
@@ -612,6 +777,7 @@ class BasePage(Singleton):
                               .format(count, time.time()-start_time), 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def reset(self):
         """
         Reset the application
@@ -621,6 +787,7 @@ class BasePage(Singleton):
         """
         self.driver.reset()
 
+    @element_cache.action()
     def is_select(self, *loc):
         """
         Check whether the control is selected.
@@ -631,9 +798,10 @@ class BasePage(Singleton):
         :Usage:
             driver.is_select(*locator)
         """
+        from selenium.common import exceptions as Ex
         start_time = time.time()
         try:
-            self.find_element(*loc).is_selected()
+            self.element_operation(loc, lambda element: element.is_selected())
             self.l.get_logger('The element <{0} -> {1} > has been selected,Spend {2} seconds'
                               .format(loc[0], loc[1], time.time()-start_time), 'SUCCESS')
             return True
@@ -642,6 +810,7 @@ class BasePage(Singleton):
                               .format(loc[0], loc[1], time.time()-start_time), 'SUCCESS')
             return False
 
+    @element_cache.action(navigates=True)
     def element_scroll(self, el_loc, tar_loc):
         """
         ELEMENT SCROLL
@@ -664,6 +833,7 @@ class BasePage(Singleton):
             self.l.get_logger('element scroll fail,Spend {0} seconds'.format(time.time()-start_time), 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def drag_and_drop(self, el_loc, tar_loc):
         """
         Mouse drag and drop event
@@ -686,6 +856,7 @@ class BasePage(Singleton):
             self.l.get_logger('drag and drop fail,Spend {0} seconds'.format(time.time()-start_time), 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def tap(self, *coordinates, timeout=10):
         """
         Simulate finger click
@@ -707,6 +878,7 @@ class BasePage(Singleton):
                               .format(time.time()-start_time), 'FAIL')
             raise
 
+    @element_cache.action(navigates=True)
     def background_app(self, timeout=5):
         """
         App background operation
@@ -741,6 +913,7 @@ class BasePage(Singleton):
         self.l.get_logger("Installed app {0}, Spend {1} seconds"
                           .format(package, time.time()-start_time), 'INFO')
 
+    @element_cache.action(navigates=True)
     def close_app(self):
         """
         Stop app running application
@@ -785,8 +958,50 @@ class BasePage(Singleton):
             driver.get_page_source()
         """
         start_time = time.time()
-        self.l.get_logger("Gets the source of the current page".format(time.time()-start_time), 'INFO')
-        return self.driver.page_source
+        source = self.snapshots.refresh().source
+        self.l.get_logger("Gets the source of the current page, Spend {0} seconds".format(time.time()-start_time), 'INFO')
+        return source
+
+    @element_cache.action()
+    def snapshot(self, max_age=None):
+        """
+        The parsed page source, fetched again only when an action changed the screen or
+        the last one is older than max_age seconds. Query it for many elements without a
+        request per element.
+
+        :Args:
+         - max_age: Seconds, default page_source.MAX_AGE, INT OR FLOAT TYPE.
+
+        :Usage:
+            driver.snapshot().attributes('id', 'title', 'text', 'bounds')
+        """
+        return self.snapshots.get(max_age)
+
+    def get_texts(self, *loc):
+        """
+        Texts of every element of a locator, read from one page source snapshot.
+
+        :Args:
+         - loc: Element localizer, TUPLE TYPE.
+
+        :Usage:
+            driver.get_texts(*locator)
+        """
+        return [values['text'] for values in self.get_attributes(*loc, names=('text',))]
+
+    def get_attributes(self, *loc, names=('text', 'bounds')):
+        """
+        Attributes of every element of a locator, from one page source snapshot when the
+        locator can be answered on it, otherwise one request per element.
+
+        :Args:
+         - loc: Element localizer, TUPLE TYPE.
+         - names: get_attribute() names, TUPLE TYPE.
+
+        :Usage:
+            driver.get_attributes(*locator, names=('text', 'checked'))
+        """
+        return self.find_elements(*loc, find_way='all').attributes(*names)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  page_source
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Page source parsed once into indexed nodes, answering locator and attribute queries locally
+# ========================================================
+import io
+import re
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+
+# Attributes looked up through an index instead of a scan of every node.
+INDEXED_ATTRIBUTES = ('resource-id', 'text', 'class', 'content-desc')
+
+# get_attribute() names of UiAutomator2 and the attribute they are in the page source.
+SOURCE_ATTRIBUTES = {
+    'resourceId': 'resource-id',
+    'contentDescription': 'content-desc',
+    'className': 'class',
+}
+
+# Locator strategy -> the attribute it matches.
+LOCATOR_ATTRIBUTES = {
+    'id': 'resource-id',
+    'class name': 'class',
+    'accessibility id': 'content-desc',
+}
+
+# A snapshot is used again for this many seconds when no action changed the screen since,
+# the screen still moves by itself (loading, animations).
+MAX_AGE = 1.0
+
+BOUNDS_PATTERN = re.compile(r'\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]')
+
+# The XPath the snapshot answers: //tag or //* with [@attribute="value"] predicates.
+XPATH_PATTERN = re.compile(r'^//(\*|[\w.$-]+)((?:\[@[\w:-]+=(?:"[^"]*"|\'[^\']*\')\])*)$')
+
+XPATH_PREDICATE = re.compile(r'\[@([\w:-]+)=(?:"([^"]*)"|\'([^\']*)\')\]')
+
+
+def parse_bounds(bounds):
+    """
+    (left, top, right, bottom) of a page source bounds attribute, None when absent.
+
+    :Usage:
+        parse_bounds('[0,63][1080,210]') -> (0, 63, 1080, 210)
+    """
+    match = BOUNDS_PATTERN.match(bounds or '')
+    return tuple(int(value) for value in match.groups()) if match else None
+
+
+class Node(object):
+
+    __slots__ = ('index', 'parent', 'depth', 'tag', 'attrib')
+
+    def __init__(self, index, parent, depth, tag, attrib):
+        self.index = index
+        self.parent = parent
+        self.depth = depth
+        self.tag = tag
+        self.attrib = attrib
+
+    def get(self, name, default=None):
+        """
+        An attribute by its page source or get_attribute() name; 'bounds' as a tuple.
+        """
+        value = self.attrib.get(SOURCE_ATTRIBUTES.get(name, name), default)
+        return parse_bounds(value) if name == 'bounds' else value
+
+    @property
+    def text(self):
+        return self.attrib.get('text')
+
+    @property
+    def bounds(self):
+        return parse_bounds(self.attrib.get('bounds'))
+
+    def __repr__(self):
+        return '<Node {0} {1} {2!r}>'.format(self.index, self.tag, self.attrib.get('resource-id') or self.text)
+
+
+class Snapshot(object):
+
+    def __init__(self, source):
+        """
+        The nodes of a page source in document order, which is the order find_elements
+        returns elements in, indexed by tag and by INDEXED_ATTRIBUTES. The source is read
+        with the incremental ElementTree parser, each element is dropped once its node
+        is taken, so no tree is kept.
+
+        :Args:
+         - source: driver.page_source, STR OR BYTES TYPE.
+
+        :Usage:
+            snapshot = Snapshot(driver.page_source)
+            snapshot.attributes('id', 'title', 'text', 'bounds')
+        """
+        self.source = source
+        self.taken = time.monotonic()
+        self.nodes = []
+        self.tags = {}
+        self.indexes = {name: {} for name in INDEXED_ATTRIBUTES}
+        # 'title' -> nodes of 'com.example:id/title', as the 'id' strategy matches both
+        self.short_ids = {}
+        self._parse(source.encode('utf-8') if isinstance(source, str) else source)
+
+    def _parse(self, data):
+        nodes, tags, indexes, short_ids = self.nodes, self.tags, self.indexes, self.short_ids
+        stack = []
+        for event, element in ElementTree.iterparse(io.BytesIO(data), events=('start', 'end')):
+            if event == 'end':
+                stack.pop()
+                element.clear()
+                continue
+            # A copy: the pure Python parser empties this very dict on element.clear().
+            attrib = dict(element.attrib)
+            node = Node(len(nodes), stack[-1] if stack else None, len(stack), element.tag, attrib)
+            nodes.append(node)
+            stack.append(node)
+            tags.setdefault(element.tag, []).append(node)
+            for name in INDEXED_ATTRIBUTES:
+                value = attrib.get(name)
+                if value is not None:
+                    indexes[name].setdefault(value, []).append(node)
+            resource_id = attrib.get('resource-id')
+            if resource_id and ':id/' in resource_id:
+                short_ids.setdefault(resource_id.split(':id/', 1)[1], []).append(node)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def age(self):
+        return time.monotonic() - self.taken
+
+    def find(self, by, value):
+        """
+        The nodes a locator matches, in document order. None for a locator the snapshot
+        can not answer, such as a UiAutomator selector or an XPath with axes or functions.
+
+        :Args:
+         - by: Locator strategy, STR TYPE.
+         - value: Locator value, STR TYPE.
+
+        :Usage:
+            snapshot.find('id', 'title')
+        """
+        if by == 'id':
+            nodes = self.indexes['resource-id'].get(value, [])
+            short = [] if ':id/' in value else self.short_ids.get(value, [])
+            return sorted(nodes + short, key=lambda node: node.index) if nodes and short else list(nodes or short)
+        if by in LOCATOR_ATTRIBUTES:
+            return list(self.indexes[LOCATOR_ATTRIBUTES[by]].get(value, []))
+        if by == 'xpath':
+            return self._xpath(value)
+        return None
+
+    def _xpath(self, path):
+        match = XPATH_PATTERN.match(path)
+        if match is None:
+            return None
+        tag = match.group(1)
+        predicates = [(name, double or single) for name, double, single in XPATH_PREDICATE.findall(match.group(2))]
+        # Start from the smallest indexed candidate list, then check the rest on each node.
+        candidates = self.nodes if tag == '*' else self.tags.get(tag, [])
+        for name, value in predicates:
+            if name in self.indexes:
+                indexed = self.indexes[name].get(value, [])
+                if len(indexed) < len(candidates):
+                    candidates = indexed
+        return [node for node in candidates
+                if (tag == '*' or node.tag == tag) and all(node.attrib.get(name) == value for name, value in predicates)]
+
+    def first(self, by, value):
+        nodes = self.find(by, value)
+        return nodes[0] if nodes else None
+
+    def exists(self, by, value):
+        return bool(self.find(by, value))
+
+    def attributes(self, by, value, *names):
+        """
+        One dict of the named attributes per matched node, None when the locator can
+        not be answered.
+
+        :Usage:
+            snapshot.attributes('id', 'title', 'text', 'bounds')
+            -> [{'text': 'Inbox', 'bounds': (0, 63, 1080, 210)}, ...]
+        """
+        nodes = self.find(by, value)
+        if nodes is None:
+            return None
+        return [{name: node.get(name) for name in names} for node in nodes]
+
+
+class SnapshotCache(object):
+
+    def __init__(self, driver, max_age=MAX_AGE):
+        """
+        The last snapshot of a driver, taken again when it is older than max_age or an
+        action that changes the screen called invalidate().
+
+        :Args:
+         - driver: webdriver.Remote.
+         - max_age: Seconds a snapshot is used, FLOAT TYPE.
+        """
+        self.driver = driver
+        self.max_age = max_age
+        self.fetches = 0
+        self.__snapshot = None
+        self.__lock = threading.Lock()
+
+    def get(self, max_age=None):
+        """
+        A snapshot no older than max_age, the instance max_age by default.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self.__lock:
+            snapshot = self.__snapshot
+        if snapshot is not None and snapshot.age <= max_age:
+            return snapshot
+        return self.refresh()
+
+    def refresh(self):
+        """
+        Fetch and parse the page source now.
+        """
+        snapshot = Snapshot(self.driver.page_source)
+        with self.__lock:
+            self.__snapshot = snapshot
+            self.fetches += 1
+        return snapshot
+
+    def invalidate(self):
+        with self.__lock:
+            self.__snapshot = None
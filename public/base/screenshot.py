@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  screenshot
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Screenshots decoded once in memory, encoded and written by background threads
+# ========================================================
+import atexit
+import collections
+import contextlib
+import io
+import threading
+import time
+from concurrent import futures
+from public.common import logger
+
+# Threads encoding and writing images, and images allowed to wait for them before
+# save() and write() block, which bounds the memory held by decoded frames.
+WRITER_THREADS = 2
+
+MAX_PENDING = 16
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(MAX_PENDING)
+_futures = set()
+
+
+def _writer():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = futures.ThreadPoolExecutor(max_workers=WRITER_THREADS, thread_name_prefix='screenshot-writer')
+            atexit.register(flush)
+        return _executor
+
+
+def _submit(function, *args):
+    _pending.acquire()
+    try:
+        future = _writer().submit(function, *args)
+    except Exception:
+        _pending.release()
+        raise
+    with _executor_lock:
+        _futures.add(future)
+    future.add_done_callback(_done)
+    return future
+
+
+def _done(future):
+    with _executor_lock:
+        _futures.discard(future)
+    _pending.release()
+    if not future.cancelled() and future.exception() is not None:
+        logger.Logger().get_logger('Failed to write the screenshot: {0!r}'.format(future.exception()), 'ERROR')
+
+
+def _write_png(data, path):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def _save_image(image, path):
+    image.save(path, format='PNG')
+    return path
+
+
+def capture(driver):
+    """
+    Take a screenshot as PNG bytes and decode it once into a PIL image.
+
+    :Args:
+     - driver: webdriver.Remote.
+
+    :Usage:
+        image = capture(driver)
+    """
+    from PIL import Image
+    image = Image.open(io.BytesIO(driver.get_screenshot_as_png()))
+    image.load()
+    return image
+
+
+def element_box(element):
+    """
+    (left, top, right, bottom) of a WebElement in screenshot pixels.
+
+    :Args:
+     - element: WebElement.
+    """
+    location, size = element.location, element.size
+    return location['x'], location['y'], location['x'] + size['width'], location['y'] + size['height']
+
+
+def annotate(image, box, outline='#8B0000'):
+    """
+    Draw a rectangle round box on the image, in place.
+
+    :Args:
+     - image: PIL image.
+     - box: (left, top, right, bottom), TUPLE TYPE.
+    """
+    from PIL import ImageDraw
+    ImageDraw.Draw(image).rectangle(box, outline=outline)
+    return image
+
+
+def save(image, path):
+    """
+    Encode the image as PNG and write it to path on a writer thread. Blocks only while
+    MAX_PENDING images are already waiting.
+
+    :Args:
+     - image: PIL image, not modified by the caller afterwards.
+     - path: Target file, STR TYPE.
+
+    :Usage:
+        save(annotate(capture(driver), box), run_layout().path('img', 'login'))
+    """
+    return _submit(_save_image, image, path)
+
+
+def write(data, path):
+    """
+    Write PNG bytes as they came from the driver on a writer thread.
+
+    :Args:
+     - data: PNG bytes, BYTES TYPE.
+     - path: Target file, STR TYPE.
+    """
+    return _submit(_write_png, data, path)
+
+
+def flush(timeout=None):
+    """
+    Wait until every image submitted so far is on disk, such as at the end of a case.
+
+    :Usage:
+        screenshot.flush()
+    """
+    with _executor_lock:
+        pending = list(_futures)
+    futures.wait(pending, timeout)
+    return all(future.done() for future in pending)
+
+
+# Capture policies of BasePage actions.
+ALWAYS = 'always'
+
+ON_FAILURE = 'on-failure'
+
+SAMPLED = 'sampled'
+
+RING_BUFFER = 'ring-buffer'
+
+# Memory the frames of one ring buffer may hold, decoded.
+RING_BUFFER_BYTES = 64 * 1024 * 1024
+
+
+class _DeviceFrames(object):
+
+    def __init__(self):
+        # Actions, ring buffer and counters of one device under a policy.
+        self.actions = 0
+        self.buffer = collections.deque()
+        self.buffered_bytes = 0
+        self.stats = collections.Counter()
+
+
+class CapturePolicy(object):
+
+    def __init__(self, mode=ALWAYS, every=10, frames=5, max_bytes=RING_BUFFER_BYTES):
+        """
+        When BasePage actions take their evidence screenshot:
+         - always: every action;
+         - on-failure: none, only the screen of a failed action;
+         - sampled: every Nth action, and failures;
+         - ring-buffer: every action into memory, the last frames are written only
+           when an action fails.
+        Devices sharing a policy are counted and buffered apart, a failure on one device
+        writes the frames of that device only.
+
+        :Args:
+         - mode: ALWAYS, ON_FAILURE, SAMPLED or RING_BUFFER, STR TYPE.
+         - every: N of SAMPLED, INT TYPE.
+         - frames: Frames RING_BUFFER keeps, INT TYPE.
+         - max_bytes: Decoded bytes RING_BUFFER keeps, older frames are dropped first, INT TYPE.
+
+        :Usage:
+            set_capture_policy(CapturePolicy(RING_BUFFER, frames=10))
+        """
+        if mode not in (ALWAYS, ON_FAILURE, SAMPLED, RING_BUFFER):
+            raise ValueError('Unknown capture policy {0!r}'.format(mode))
+        self.mode = mode
+        self.every = max(1, int(every))
+        self.frames = max(1, int(frames))
+        self.max_bytes = max_bytes
+        self.__devices = {}
+        self.__lock = threading.Lock()
+        self.stats = collections.Counter()
+
+    def _device(self, device):
+        # Called with self.__lock held.
+        frames = self.__devices.get(device)
+        if frames is None:
+            frames = self.__devices[device] = _DeviceFrames()
+        return frames
+
+    def _count(self, frames, **values):
+        # Called with self.__lock held.
+        frames.stats.update(values)
+        self.stats.update(values)
+        with _totals_lock:
+            _totals.update(values)
+
+    def wants_frame(self, device=None):
+        """
+        Whether the action starting now should be captured.
+
+        :Args:
+         - device: Device the action runs on, STR TYPE.
+        """
+        with self.__lock:
+            frames = self._device(device)
+            frames.actions += 1
+            self._count(frames, actions=1)
+            if self.mode == SAMPLED:
+                return frames.actions % self.every == 1 % self.every
+            return self.mode in (ALWAYS, RING_BUFFER)
+
+    def add_frame(self, image, layout, name, seconds, device=None):
+        """
+        Keep the evidence of one action: saved at once, or buffered by RING_BUFFER.
+
+        :Args:
+         - image: PIL image of the action.
+         - layout: RunLayout the file goes to.
+         - name: Readable part of the file name, STR TYPE.
+         - seconds: Time the capture took, FLOAT TYPE.
+         - device: Device the action runs on, STR TYPE.
+        """
+        with self.__lock:
+            frames = self._device(device)
+            self._count(frames, captures=1, capture_ms=int(seconds * 1000))
+            if self.mode != RING_BUFFER:
+                self._count(frames, written=1)
+            else:
+                size = image.width * image.height * len(image.getbands())
+                frames.buffer.append((image, layout, name, size))
+                frames.buffered_bytes += size
+                while frames.buffer and (len(frames.buffer) > self.frames or frames.buffered_bytes > self.max_bytes):
+                    frames.buffered_bytes -= frames.buffer.popleft()[3]
+                    self._count(frames, dropped=1)
+                return None
+        return save(image, layout.path('img', name))
+
+    def on_failure(self, driver, layout, name, device=None):
+        """
+        Write the frames buffered for the device and the screen of the failed action.
+
+        :Args:
+         - driver: webdriver.Remote.
+         - layout: RunLayout the files go to.
+         - name: Readable part of the file name, STR TYPE.
+         - device: Device the action failed on, STR TYPE.
+        """
+        with self.__lock:
+            state = self._device(device)
+            frames, state.buffer, state.buffered_bytes = list(state.buffer), collections.deque(), 0
+            self._count(state, failures=1, written=len(frames))
+        for image, frame_layout, frame_name, _ in frames:
+            save(image, frame_layout.path('img', frame_name))
+        start_time = time.perf_counter()
+        try:
+            image = capture(driver)
+        except Exception as error:
+            logger.Logger().get_logger('Failed to capture the failure screen: {0!r}'.format(error), 'ERROR')
+            return
+        with self.__lock:
+            self._count(state, captures=1, written=1, capture_ms=int((time.perf_counter() - start_time) * 1000))
+        save(image, layout.path('img', 'fail-' + name))
+
+    def summary(self, device=None):
+        """
+        Counters of every device, or of the given one.
+
+        :Args:
+         - device: Device, default all of them, STR TYPE.
+        """
+        with self.__lock:
+            devices = list(self.__devices.values()) if device is None else [self.__devices.get(device, _DeviceFrames())]
+            summary = dict(self.stats) if device is None else dict(devices[0].stats)
+            summary.update(mode=self.mode, buffered_bytes=sum(frames.buffered_bytes for frames in devices))
+            return summary
+
+
+# Counters of every policy of the run, for capture_summary().
+_totals = collections.Counter()
+_totals_lock = threading.Lock()
+
+_run_policy = None
+
+_case_policy = threading.local()
+
+
+def set_capture_policy(policy):
+    """
+    The policy of the whole run, by default the [Capture] section of config.ini or ALWAYS.
+
+    :Args:
+     - policy: CapturePolicy.
+    """
+    global _run_policy
+    _run_policy = policy
+    return policy
+
+
+@contextlib.contextmanager
+def case_policy(policy):
+    """
+    Use another policy for the actions this thread runs inside the block, such as one case.
+
+    :Usage:
+        with case_policy(CapturePolicy(ON_FAILURE)):
+            run_case()
+    """
+    previous = getattr(_case_policy, 'policy', None)
+    _case_policy.policy = policy
+    try:
+        yield policy
+    finally:
+        _case_policy.policy = previous
+
+
+def current_policy():
+    """
+    The case policy of this thread if there is one, otherwise the run policy.
+    """
+    global _run_policy
+    policy = getattr(_case_policy, 'policy', None)
+    if policy is not None:
+        return policy
+    if _run_policy is None:
+        from config import parameters
+        _run_policy = CapturePolicy(
+            parameters.READ_CONF.get_data('Capture', 'policy', ALWAYS),
+            every=parameters.READ_CONF.get_int('Capture', 'every', 10),
+            frames=parameters.READ_CONF.get_int('Capture', 'frames', 5),
+            max_bytes=parameters.READ_CONF.get_int('Capture', 'max_bytes', RING_BUFFER_BYTES))
+    return _run_policy
+
+
+def capture_summary():
+    """
+    Capture counters and cost of every policy used in the run, added up.
+
+    :Usage:
+        capture_summary()
+        -> {'actions': 412, 'captures': 42, 'written': 42, 'capture_ms': 9120, 'failures': 1, 'dropped': 0}
+    """
+    with _totals_lock:
+        return dict(_totals)
+
+
+def _log_summary():
+    summary = capture_summary()
+    if summary.get('actions'):
+        logger.Logger().get_logger('Screenshot capture summary: {0}'.format(
+            ', '.join('{0} {1}'.format(key, value) for key, value in sorted(summary.items()))), 'INFO')
+
+
+atexit.register(_log_summary)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  session_pool
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Warm Appium sessions per device, reset between cases instead of created for each one
+# ========================================================
+import collections
+import contextlib
+import threading
+import time
+from public.common import logger
+from public.utils import adb
+
+# Where the default factory creates sessions, overridden by [Appium] url of config.ini.
+APPIUM_URL = 'http://127.0.0.1:4723/wd/hub'
+
+# Cases a session runs before it is recycled, a long-lived UiAutomator2 server slowly leaks.
+MAX_CASES = 50
+
+# How the app is put back in its first state between two cases:
+#  - clear: 'pm clear' the appPackage and start it again, seconds faster than a new session;
+#  - driver: the reset() of the driver, as the capabilities define it;
+#  - none: leave it as the previous case left it.
+CLEAR = 'clear'
+
+DRIVER = 'driver'
+
+NONE = 'none'
+
+
+def appium_session(capabilities):
+    """
+    Create a session on the Appium server, the default factory of SessionPool.
+
+    :Args:
+     - capabilities: Desired capabilities, DICT TYPE.
+    """
+    from appium import webdriver
+    from config import parameters
+    url = parameters.READ_CONF.get_data('Appium', 'url', APPIUM_URL)
+    try:
+        from appium.options.common import AppiumOptions
+    except ImportError:
+        return webdriver.Remote(url, desired_capabilities=capabilities)
+    options = AppiumOptions()
+    options.load_capabilities(capabilities)
+    return webdriver.Remote(url, options=options)
+
+
+def device_of(capabilities):
+    """
+    Serial of the device of desired or session capabilities, None when they have none.
+    """
+    for name in ('udid', 'appium:udid', 'deviceUDID', 'deviceName', 'appium:deviceName'):
+        if capabilities.get(name):
+            return capabilities[name]
+    return None
+
+
+class Session(object):
+
+    def __init__(self, device, driver, seconds):
+        self.device = device
+        self.driver = driver
+        self.create_seconds = seconds
+        self.created = time.monotonic()
+        self.cases = 0
+
+
+class SessionPool(object):
+
+    def __init__(self, factory=appium_session, max_cases=MAX_CASES, reset=CLEAR):
+        """
+        One warm session per device. A case borrows the session of its device, which is
+        health checked and reset first; it is recycled after max_cases cases or a failed
+        case, and created again on the next borrow.
+
+        :Args:
+         - factory: Callable creating a driver from capabilities, CALLABLE TYPE.
+         - max_cases: Cases per session, INT TYPE.
+         - reset: CLEAR, DRIVER or NONE, STR TYPE.
+
+        :Usage:
+            pool = SessionPool()
+            with pool.session(capabilities) as driver:
+                run_case(driver)
+        """
+        if reset not in (CLEAR, DRIVER, NONE):
+            raise ValueError('Unknown reset {0!r}'.format(reset))
+        self.factory = factory
+        self.max_cases = max_cases
+        self.reset = reset
+        self.l = logger.Logger()
+        self.__sessions = {}
+        self.__busy = collections.defaultdict(threading.Lock)
+        self.__lock = threading.Lock()
+        self.__metrics = collections.defaultdict(collections.Counter)
+
+    def _count(self, device, **values):
+        with self.__lock:
+            self.__metrics[device].update(values)
+
+    def _create(self, device, capabilities):
+        start_time = time.perf_counter()
+        try:
+            driver = self.factory(capabilities)
+        except Exception:
+            self._count(device, create_failures=1)
+            self.l.get_logger('Failed to create the session of {0}, Spend {1} seconds'
+                              .format(device, time.perf_counter() - start_time), 'FAIL', device=device)
+            raise
+        seconds = time.perf_counter() - start_time
+        with self.__lock:
+            metrics = self.__metrics[device]
+            metrics.update(created=1, create_ms=int(seconds * 1000))
+            metrics['max_create_ms'] = max(metrics['max_create_ms'], int(seconds * 1000))
+        self.l.get_logger('Created the session of {0}, Spend {1} seconds'.format(device, seconds),
+                          'INFO', duration=seconds, device=device)
+        return Session(device, driver, seconds)
+
+    def _healthy(self, session):
+        try:
+            session.driver.orientation
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, session, capabilities):
+        if self.reset == CLEAR and capabilities.get('appPackage'):
+            package = capabilities['appPackage']
+            adb.Adb(session.device).clear_data(package)
+            session.driver.activate_app(package)
+        elif self.reset in (CLEAR, DRIVER):
+            session.driver.reset()
+
+    def _quit(self, session):
+        try:
+            session.driver.quit()
+        except Exception:
+            # The session is gone already, which is often why it is recycled.
+            pass
+
+    def acquire(self, capabilities):
+        """
+        The session of the device for one case, waiting while another case has it.
+
+        :Args:
+         - capabilities: Desired capabilities, with udid or deviceName, DICT TYPE.
+        """
+        device = device_of(capabilities)
+        with self.__lock:
+            busy = self.__busy[device]
+        busy.acquire()
+        try:
+            with self.__lock:
+                session = self.__sessions.pop(device, None)
+            if session is not None:
+                if self._healthy(session):
+                    try:
+                        self._reset(session, capabilities)
+                        self._count(device, reused=1)
+                    except Exception as error:
+                        self.l.get_logger('Failed to reset the session of {0}: {1!r}'.format(device, error),
+                                          'ERROR', device=device)
+                        self._count(device, reset_failures=1)
+                        self._quit(session)
+                        session = None
+                else:
+                    self._count(device, unhealthy=1)
+                    self._quit(session)
+                    session = None
+            if session is None:
+                session = self._create(device, capabilities)
+            session.cases += 1
+            return session
+        except Exception:
+            busy.release()
+            raise
+
+    def release(self, session, failed=False):
+        """
+        Give the session back after its case; it is quit instead when the case failed
+        or it ran max_cases cases.
+
+        :Args:
+         - session: From acquire(), Session.
+         - failed: The case failed, the app or the server may be in any state, BOOLEAN TYPE.
+        """
+        try:
+            if failed or session.cases >= self.max_cases:
+                self._count(session.device, recycled=1)
+                self._quit(session)
+            else:
+                with self.__lock:
+                    self.__sessions[session.device] = session
+        finally:
+            self.__busy[session.device].release()
+
+    @contextlib.contextmanager
+    def session(self, capabilities):
+        """
+        Borrow the driver of a device for the block, a failure in the block recycles it.
+
+        :Usage:
+            with pool.session(capabilities) as driver:
+                BasePage(driver).click(*locator)
+        """
+        session = self.acquire(capabilities)
+        try:
+            yield session.driver
+        except BaseException:
+            self.release(session, failed=True)
+            raise
+        self.release(session)
+
+    def metrics(self):
+        """
+        Per device: sessions created and their creation time, sessions reused, recycled,
+        unhealthy and failures.
+
+        :Usage:
+            pool.metrics()['596cb85a']
+            -> {'created': 2, 'create_ms': 21400, 'max_create_ms': 11800, 'reused': 48, 'recycled': 1}
+        """
+        with self.__lock:
+            return {device: dict(values) for device, values in self.__metrics.items()}
+
+    def close(self):
+        """
+        Quit every idle session and log the metrics.
+        """
+        with self.__lock:
+            sessions, self.__sessions = list(self.__sessions.values()), {}
+        for session in sessions:
+            self._quit(session)
+        for device, values in sorted(self.metrics().items()):
+            self.l.get_logger('Sessions of {0}: {1}'.format(
+                device, ', '.join('{0} {1}'.format(key, value) for key, value in sorted(values.items()))),
+                'INFO', device=device)
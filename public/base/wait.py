@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  wait
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Polling waits with backoff, learned per-locator latencies and a per-case time budget
+# ========================================================
+import collections
+import contextlib
+import threading
+import time
+
+# Seconds between two polls: the first poll is immediate, then INITIAL_POLL growing by BACKOFF
+# up to MAX_POLL. A locator seen before is polled again first when it usually shows up.
+INITIAL_POLL = 0.05
+
+MAX_POLL = 1.0
+
+BACKOFF = 1.6
+
+# Weight of the newest sample in the typical latency of a key, and keys remembered.
+LEARNING_RATE = 0.3
+
+MAX_KEYS = 2000
+
+DEFAULT_TIMEOUT = 10
+
+# One finished wait, passed to every hook.
+WaitRecord = collections.namedtuple('WaitRecord', 'key waited timeout polls satisfied')
+
+
+class LatencyModel(object):
+
+    def __init__(self, max_keys=MAX_KEYS):
+        """
+        Typical time until a condition holds, per key such as a locator, as a moving
+        average of the successful waits.
+        """
+        self.max_keys = max_keys
+        self.__typical = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def typical(self, key):
+        with self.__lock:
+            return self.__typical.get(key)
+
+    def learn(self, key, seconds):
+        with self.__lock:
+            previous = self.__typical.pop(key, None)
+            self.__typical[key] = seconds if previous is None else previous + LEARNING_RATE * (seconds - previous)
+            while len(self.__typical) > self.max_keys:
+                self.__typical.popitem(last=False)
+
+
+_model = LatencyModel()
+
+_hooks = []
+
+_totals = {}
+
+_totals_lock = threading.Lock()
+
+_budget = threading.local()
+
+
+def add_hook(hook):
+    """
+    Call hook(WaitRecord) after every wait, such as to log waits that used most of
+    their timeout.
+
+    :Usage:
+        add_hook(lambda record: print(record.key, record.waited, record.timeout))
+    """
+    _hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def _record(record):
+    with _totals_lock:
+        waits, waited, timeout, polls, timeouts = _totals.get(record.key, (0, 0.0, 0.0, 0, 0))
+        _totals[record.key] = (waits + 1, waited + record.waited, timeout + record.timeout,
+                               polls + record.polls, timeouts + (not record.satisfied))
+    for hook in list(_hooks):
+        hook(record)
+
+
+def wait_summary():
+    """
+    Waits per key: count, seconds waited and allowed, polls and timeouts.
+
+    :Usage:
+        wait_summary()['id -> login']
+        -> {'waits': 12, 'waited': 3.1, 'timeout': 120.0, 'polls': 30, 'timeouts': 0}
+    """
+    with _totals_lock:
+        return {key: dict(zip(('waits', 'waited', 'timeout', 'polls', 'timeouts'), values))
+                for key, values in _totals.items()}
+
+
+@contextlib.contextmanager
+def case_budget(seconds):
+    """
+    Bound the time every wait and sleep this thread makes inside the block may take
+    together, such as one case. A wait gets what is left of the budget at most.
+
+    :Usage:
+        with case_budget(120):
+            run_case()
+    """
+    previous = getattr(_budget, 'deadline', None)
+    deadline = time.monotonic() + seconds
+    _budget.deadline = deadline if previous is None else min(previous, deadline)
+    try:
+        yield
+    finally:
+        _budget.deadline = previous
+
+
+def remaining(timeout):
+    """
+    The timeout cut to what is left of the case budget of this thread.
+    """
+    deadline = getattr(_budget, 'deadline', None)
+    if deadline is None:
+        return timeout
+    return max(0.0, min(timeout, deadline - time.monotonic()))
+
+
+def until(condition, timeout=DEFAULT_TIMEOUT, key=None, ignored=(), message=''):
+    """
+    Call condition() until it returns a true value and return that value, polling with
+    backoff. Exceptions in ignored count as not yet.
+
+    :Args:
+     - condition: Callable without arguments, CALLABLE TYPE.
+     - timeout: Seconds, cut to the case budget, INT OR FLOAT TYPE.
+     - key: What is waited for, the typical latency is learned per key, STR TYPE.
+     - ignored: Exception types, TUPLE TYPE.
+     - message: Text of the TimeoutException, STR TYPE.
+
+    :Usage:
+        element = until(lambda: driver.find_element(*loc), key='id -> login', ignored=(NoSuchElementException,))
+    """
+    allowed = remaining(timeout)
+    start = time.monotonic()
+    deadline = start + allowed
+    typical = _model.typical(key) if key is not None else None
+    interval = INITIAL_POLL
+    polls = 0
+    missed = start
+    while True:
+        polls += 1
+        try:
+            value = condition()
+        except ignored:
+            value = None
+        now = time.monotonic()
+        if value:
+            if key is not None:
+                # It held at some point since the last miss, learn the middle of that window
+                # or the typical latency creeps up by the poll interval.
+                _model.learn(key, (missed + now) / 2 - start)
+            _record(WaitRecord(key, now - start, allowed, polls, True))
+            return value
+        missed = now
+        if now >= deadline:
+            break
+        if polls == 1 and typical is not None and typical > now - start:
+            # Come back when this key usually shows up, rather than at the backoff schedule.
+            pause = typical - (now - start)
+        else:
+            pause = interval
+            interval = min(MAX_POLL, interval * BACKOFF)
+        time.sleep(max(0.0, min(pause, MAX_POLL, deadline - now)))
+    _record(WaitRecord(key, time.monotonic() - start, allowed, polls, False))
+    from selenium.common.exceptions import TimeoutException
+    if allowed < timeout:
+        message = '{0} (case budget left {1:.1f} of {2} seconds)'.format(message, allowed, timeout).strip()
+    raise TimeoutException(message)
+
+
+def sleep(seconds, key='sleep'):
+    """
+    A mandatory wait, cut to the case budget and recorded like the other waits.
+    """
+    allowed = remaining(seconds)
+    time.sleep(allowed)
+    _record(WaitRecord(key, allowed, seconds, 0, allowed >= seconds))
+    return allowed
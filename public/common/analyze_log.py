@@ -5,5 +5,350 @@
 # Author         :  Null
 # Create Date    :  11/11/2018
 # Amended by     :  Null
-# Amend History  :  11/11/2018
+# Amend History  :  10/18/2026
+# description    :  Streaming action latency statistics of the run logs
 # ========================================================
+import argparse
+import glob
+import gzip
+import heapq
+import json
+import math
+import os
+import re
+import time
+from config import parameters
+from public.common.logger import SPEND_PATTERN
+
+# Latencies are counted in logarithmic buckets 5% wide, from MIN_SECONDS up to a day, so a
+# histogram has a fixed number of buckets however many steps it counts and any percentile
+# is off by at most 5%.
+BUCKET_GROWTH = 1.05
+
+MIN_SECONDS = 1e-4
+
+MAX_BUCKET = int(math.log(86400 / MIN_SECONDS, BUCKET_GROWTH)) + 1
+
+# Distinct actions / locators tracked before the rest is folded into OTHER, and slowest steps kept.
+MAX_KEYS = 2000
+
+TOP_STEPS = 20
+
+OTHER = '<other>'
+
+FAILURE_LEVELS = ('FAIL', 'ERROR')
+
+# The level every text log line carries while Variables.DEBUG is set, whatever its real level.
+DEBUG_LEVEL = 'DEBUG'
+
+# "2026-10-18-20_24_30 [SUCCESS] Click the element <id -> login>,  Spend 0.1 seconds"
+TEXT_RECORD = re.compile(r'^(\S+) \[(\w+)\] (.*)$')
+
+# The locator of a BasePage message, '<id -> login>', its '->' is not the closing '>'.
+LOCATOR_PATTERN = re.compile(r'<\s*([^<>]*?(?:->[^<>]*?)?)\s*>')
+
+
+class Histogram(object):
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        index = 0 if seconds <= MIN_SECONDS else min(MAX_BUCKET, int(math.log(seconds / MIN_SECONDS, BUCKET_GROWTH)) + 1)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, fraction):
+        """
+        Upper bound of the bucket holding the given fraction of the samples.
+
+        :Args:
+         - fraction: 0.5 for the median, FLOAT TYPE.
+        """
+        if not self.count:
+            return None
+        rank, seen = fraction * self.count, 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.max, MIN_SECONDS * BUCKET_GROWTH ** index)
+        return self.max
+
+
+class ActionStats(object):
+
+    def __init__(self):
+        self.steps = 0
+        # Steps whose level is known, the failure rate is taken over these only.
+        self.leveled = 0
+        self.failures = 0
+        self.latency = Histogram()
+
+    def add(self, duration, failed):
+        """
+        :Args:
+         - duration: Seconds, None when the record has none, FLOAT TYPE.
+         - failed: True or False, None when the level of the record is unknown.
+        """
+        self.steps += 1
+        if failed is not None:
+            self.leveled += 1
+            self.failures += int(failed)
+        if duration is not None:
+            self.latency.add(duration)
+
+    def summary(self):
+        return {
+            'steps': self.steps,
+            'failures': self.failures,
+            'failure_rate': self.failures / self.leveled if self.leveled else None,
+            'p50': self.latency.percentile(0.5),
+            'p90': self.latency.percentile(0.9),
+            'p99': self.latency.percentile(0.99),
+            'max': self.latency.max if self.latency.count else None,
+        }
+
+
+def action_name(msg):
+    """
+    The message with its locators, numbers and 'Spend' tail taken out, so every click of
+    any element counts as one action.
+
+    :Usage:
+        action_name('Click the element <id -> login>,  Spend 0.1 seconds') -> 'Click the element <>'
+    """
+    msg = msg.split('Spend')[0].split('spend')[0]
+    msg = LOCATOR_PATTERN.sub('<>', msg)
+    msg = re.sub(r'\d+(\.\d+)?', '#', msg)
+    return msg.strip(' ,.').strip()
+
+
+def parse_text(line):
+    """
+    Record fields of one text log line, None for a line that is not a record. A DEBUG
+    line has no level, Variables.DEBUG writes every record as DEBUG.
+    """
+    match = TEXT_RECORD.match(line.rstrip('\n'))
+    if match is None:
+        return None
+    msg, level = match.group(3), match.group(2)
+    spend = SPEND_PATTERN.search(msg)
+    return {'level': None if level == DEBUG_LEVEL else level, 'msg': msg,
+            'duration': float(spend.group(1)) if spend else None}
+
+
+def parse_json(line):
+    """
+    Record fields of one JSON-lines record, None for a torn or foreign line.
+    """
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) and 'msg' in record else None
+
+
+class LogAnalyzer(object):
+
+    def __init__(self, max_keys=MAX_KEYS, top=TOP_STEPS):
+        """
+        Fold log records into per-action and per-locator statistics. Memory depends on
+        max_keys and top only, not on how many records are fed.
+
+        :Args:
+         - max_keys: Distinct actions and locators tracked each, INT TYPE.
+         - top: Slowest steps kept, INT TYPE.
+        """
+        self.max_keys = max_keys
+        self.top = top
+        self.records = 0
+        self.actions = {}
+        self.locators = {}
+        self.slowest = []
+        # (st_dev, st_ino) -> (first line, bytes already read) for incremental scans; a
+        # rotated file keeps its inode, so it is not read again under its new name
+        self.offsets = {}
+        # first line -> bytes already read, finds a file again once rotation gzipped it
+        self.heads = {}
+
+    def _stats(self, table, key):
+        if key not in table and len(table) >= self.max_keys:
+            key = OTHER
+        if key not in table:
+            table[key] = ActionStats()
+        return table[key]
+
+    def add(self, record):
+        """
+        Count one parsed record.
+
+        :Args:
+         - record: Fields from parse_text() or parse_json(), DICT TYPE.
+        """
+        self.records += 1
+        msg, duration = record['msg'], record.get('duration')
+        level = record.get('level')
+        failed = None if level is None else level in FAILURE_LEVELS
+        self._stats(self.actions, record.get('action') or action_name(msg)).add(duration, failed)
+        locator = record.get('locator')
+        if locator is None:
+            match = LOCATOR_PATTERN.search(msg)
+            locator = match.group(1) if match else None
+        if locator:
+            self._stats(self.locators, locator).add(duration, failed)
+        if duration is not None:
+            step = (duration, self.records, msg, record.get('device'))
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, step)
+            elif step > self.slowest[0]:
+                heapq.heapreplace(self.slowest, step)
+
+    def feed(self, lines, parser=parse_text):
+        for line in lines:
+            record = parser(line)
+            if record is not None:
+                self.add(record)
+
+    def read_file(self, path, parser=None):
+        """
+        Feed the part of a file not read yet. Files are told apart by inode and first line,
+        not by name: a rotated file goes on from where it was read up to, a replaced or
+        truncated one is read again from the start. A gzipped generation is matched by its
+        first line to the file it was compressed from.
+
+        :Args:
+         - path: Log file, STR TYPE.
+         - parser: Line parser, default by extension.
+        """
+        structured = '.jsonl' in os.path.basename(path)
+        parser = parser or (parse_json if structured else parse_text)
+        compressed = path.endswith('.gz')
+        stat = os.stat(path)
+        key = (stat.st_dev, stat.st_ino)
+        with (gzip.open if compressed else open)(path, 'rb') as f:
+            head = f.readline()
+            if not head.endswith(b'\n'):
+                # Not even one whole record yet.
+                return
+            known, offset = self.offsets.get(key, (None, 0))
+            if known == head and compressed:
+                # Gzip files are complete once written.
+                return
+            if known != head:
+                # A new file, or one read before under another name and gzipped since.
+                offset = self.heads.get(head, 0)
+            if not compressed and stat.st_size < offset:
+                # Truncated.
+                offset = 0
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    # A record still being written, read it on the next pass.
+                    break
+                offset += len(raw)
+                record = parser(raw.decode('utf-8', 'replace'))
+                if record is not None:
+                    self.add(record)
+        self.offsets[key] = (head, offset)
+        self.heads[head] = offset
+
+    def scan(self, directory):
+        """
+        Feed every log of a run directory, the JSON-lines streams when there are any,
+        the text logs otherwise. Calling it again reads only what was appended.
+
+        :Args:
+         - directory: result/log/<day> directory, STR TYPE.
+        """
+        paths = sorted(glob.glob(os.path.join(directory, '*.jsonl*')))
+        if not paths:
+            paths = sorted(glob.glob(os.path.join(directory, '*.log')))
+        for path in paths:
+            try:
+                self.read_file(path)
+            except OSError:
+                # Rotated away between glob() and open().
+                continue
+
+    def follow(self, directory, interval=1.0, report_every=10.0, output=print):
+        """
+        Keep scanning a live run directory and print the report periodically, until Ctrl+C.
+
+        :Args:
+         - directory: result/log/<day> directory, STR TYPE.
+         - interval: Seconds between scans, FLOAT TYPE.
+         - report_every: Seconds between reports, FLOAT TYPE.
+        """
+        last_report = 0.0
+        try:
+            while True:
+                self.scan(directory)
+                if time.monotonic() - last_report >= report_every:
+                    output(self.format_report())
+                    last_report = time.monotonic()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            output(self.format_report())
+
+    def report(self):
+        """
+        Summaries per action and per locator, and the slowest steps first.
+
+        :Usage:
+            analyzer.report()['actions']['Click the element <>']['p99']
+        """
+        return {
+            'records': self.records,
+            'actions': {key: stats.summary() for key, stats in self.actions.items()},
+            'locators': {key: stats.summary() for key, stats in self.locators.items()},
+            'slowest': [{'duration': duration, 'msg': msg, 'device': device}
+                        for duration, _, msg, device in sorted(self.slowest, reverse=True)],
+        }
+
+    def format_report(self, limit=20):
+        report = self.report()
+        lines = ['records {0}'.format(report['records'])]
+        for title in ('actions', 'locators'):
+            lines.append('')
+            lines.append('{0:<60} {1:>7} {2:>6} {3:>9} {4:>9} {5:>9}'.format(
+                title, 'steps', 'fail%', 'p50', 'p90', 'p99'))
+            rows = sorted(report[title].items(), key=lambda item: -(item[1]['p99'] or 0))[:limit]
+            for key, summary in rows:
+                rate = summary['failure_rate']
+                lines.append('{0:<60} {1:>7} {2:>6} {3:>9} {4:>9} {5:>9}'.format(
+                    key[:60], summary['steps'], '-' if rate is None else '{0:.1f}'.format(rate * 100),
+                    *[_seconds(summary[name]) for name in ('p50', 'p90', 'p99')]))
+        lines.append('')
+        lines.append('slowest steps')
+        for step in report['slowest'][:limit]:
+            lines.append('{0:>9} {1} {2}'.format(_seconds(step['duration']), step['device'] or '-', step['msg']))
+        return '\n'.join(lines)
+
+
+def _seconds(value):
+    return '-' if value is None else '{0:.3f}s'.format(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Action latency statistics of the run logs.')
+    parser.add_argument('directory', nargs='?', help='default result/log/<today>')
+    parser.add_argument('--follow', action='store_true', help='keep reading a live run')
+    parser.add_argument('--top', type=int, default=TOP_STEPS, help='slowest steps to keep')
+    args = parser.parse_args()
+
+    directory = args.directory or parameters.run_layout().directory('log')
+    analyzer = LogAnalyzer(top=args.top)
+    if args.follow:
+        analyzer.follow(directory)
+    else:
+        analyzer.scan(directory)
+        print(analyzer.format_report())
+
+
+if __name__ == '__main__':
+    main()
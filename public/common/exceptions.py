@@ -7,3 +7,24 @@
 # Amended by     :  Null
 # Amend History  :  11/11/2018
 # ========================================================
+
+
+class AdbError(Exception):
+    """
+    The adb server or the adb client refused a request.
+    """
+    pass
+
+
+class AdbConnectionError(AdbError):
+    """
+    The local adb server could not be reached.
+    """
+    pass
+
+
+class AdbTimeoutError(AdbError):
+    """
+    An adb command did not finish before its deadline, the command was killed.
+    """
+    pass
@@ -7,12 +7,200 @@
 # Amended by     :  Null
 # Amend History  :  11/11/2018
 # ========================================================
+import os
+import socket
+import tempfile
+import threading
 import yaml
 import subprocess
+from concurrent import futures
 from public.utils import adb
+from public.utils.adb_client import AdbClient
 from public.common import logger
 from config import parameters
 
+# Devices probed at the same time, bounds the load on the local adb server.
+MAX_WORKERS = 8
+
+# Seconds a single device may take to answer before it is left out of device.yaml.
+PROBE_TIMEOUT = 30
+
+
+class DeviceTracker(object):
+
+    def __init__(self, client=None, retry_interval=1.0):
+        """
+        Follow the adb server's host:track-devices stream and keep serial -> state in memory.
+
+        :Args:
+         - client: AdbClient of the adb server, default the local one.
+         - retry_interval: Seconds between reconnects when the adb server goes away, FLOAT TYPE.
+        """
+        self.client = client or AdbClient()
+        self.retry_interval = retry_interval
+        self.__states = {}
+        self.__callbacks = []
+        self.__condition = threading.Condition()
+        self.__stopped = threading.Event()
+        self.__sock = None
+        self.__thread = None
+        self.connected = False
+
+    def add_callback(self, callback):
+        """
+        Call callback(serial, old_state, new_state) on the tracker thread for every change,
+        a state of None means the device is not attached.
+
+        :Args:
+         - callback: Change listener, CALLABLE TYPE.
+        """
+        with self.__condition:
+            self.__callbacks.append(callback)
+        return callback
+
+    def remove_callback(self, callback):
+        with self.__condition:
+            self.__callbacks.remove(callback)
+
+    def states(self):
+        """
+        A copy of the registry, serial -> state ('device', 'offline', 'unauthorized', ...).
+
+        :Usage:
+            DeviceTracker().start().states()
+        """
+        with self.__condition:
+            return dict(self.__states)
+
+    def devices(self, state='device'):
+        """
+        Serial numbers of the devices in the given state.
+
+        :Args:
+         - state: Device state, STR TYPE.
+        """
+        with self.__condition:
+            return [serial for serial, value in self.__states.items() if value == state]
+
+    def wait_for(self, serial, state='device', timeout=None):
+        """
+        Block until the device reaches the state, returns False on timeout.
+
+        :Args:
+         - serial: Device serial number, STR TYPE.
+         - state: Expected state, None waits for the device to go away.
+         - timeout: Seconds to wait, default forever.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(lambda: self.__states.get(serial) == state, timeout)
+
+    def _update(self, states):
+        with self.__condition:
+            old_states, self.__states = self.__states, states
+            callbacks = list(self.__callbacks)
+            self.__condition.notify_all()
+        changes = [(serial, old_states.get(serial), states.get(serial))
+                   for serial in set(old_states) | set(states)
+                   if old_states.get(serial) != states.get(serial)]
+        for serial, old_state, new_state in sorted(changes, key=lambda change: change[0]):
+            for callback in callbacks:
+                try:
+                    callback(serial, old_state, new_state)
+                except Exception as error:
+                    logger.Logger().get_logger(
+                        'The device tracker callback failed: {0!r}'.format(error), 'ERROR')
+
+    @staticmethod
+    def parse(payload):
+        """
+        Turn one track-devices message into serial -> state.
+
+        :Args:
+         - payload: 'serial\\tstate' lines, BYTES TYPE.
+        """
+        states = {}
+        for line in payload.decode('utf-8', 'replace').splitlines():
+            if '\t' in line:
+                serial, state = line.split('\t', 1)
+                states[serial] = state.strip()
+        return states
+
+    def _run(self):
+        while not self.__stopped.is_set():
+            try:
+                self.__sock = self.client.open_host('host:track-devices')
+                self.connected = True
+                while not self.__stopped.is_set():
+                    self._update(self.parse(self.client.read_payload(self.__sock)))
+            except Exception as error:
+                # Only report a lost stream, retries against a server that is down stay quiet.
+                if self.connected and not self.__stopped.is_set():
+                    logger.Logger().get_logger(
+                        'Lost the adb server device stream: {0!r}'.format(error), 'WARN')
+            finally:
+                self.connected = False
+                if self.__sock is not None:
+                    self.__sock.close()
+                    self.__sock = None
+            if not self.__stopped.is_set():
+                # Without the server no device is reachable, report them all as gone.
+                self._update({})
+                self.__stopped.wait(self.retry_interval)
+
+    def start(self):
+        """
+        Start following the adb server in a daemon thread.
+
+        :Usage:
+            tracker = DeviceTracker().start()
+            tracker.add_callback(lambda serial, old, new: print(serial, old, new))
+        """
+        if self.__thread is None:
+            self.__stopped.clear()
+            self.__thread = threading.Thread(target=self._run, name='DeviceTracker', daemon=True)
+            self.__thread.start()
+        return self
+
+    def stop(self):
+        self.__stopped.set()
+        sock = self.__sock
+        if sock is not None:
+            # Unblocks the pending read of the tracker thread.
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    @property
+    def running(self):
+        return self.__thread is not None and self.connected
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+# Process wide tracker, started by start_tracking().
+_tracker = None
+
+
+def start_tracking():
+    """
+    Start the process wide DeviceTracker, get_android_devices() answers from it while it runs.
+
+    :Usage:
+        start_tracking().add_callback(on_device_change)
+    """
+    global _tracker
+    if _tracker is None:
+        _tracker = DeviceTracker().start()
+    return _tracker
+
 
 def get_android_devices():
     """
@@ -21,6 +209,9 @@ def get_android_devices():
     :Usage:
         get_devices()
     """
+    if _tracker is not None and _tracker.running:
+        return _tracker.devices()
+
     android_devices_list = []
     devices = subprocess.Popen('adb devices', shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     for device in devices.stdout.readlines():
@@ -32,23 +223,67 @@ def get_android_devices():
     return android_devices_list
 
 
-def save_devices_yaml():
+def probe_device(device, timeout=PROBE_TIMEOUT):
     """
-    The test device information is saved to yaml
+    Read everything device.yaml needs from one device in a single adb round trip.
+
+    :Args:
+     - device: Device serial number, STR TYPE.
+     - timeout: Seconds to wait for the device, INT OR FLOAT TYPE.
 
     :Usage:
-        save.devices_yaml()
+        probe_device('596cb85a')
     """
+    cmd = adb.Adb(device, timeout=timeout)
+    facts = cmd.snapshot()
+    return {'deviceName': device, 'platformName': 'Android', 'platformVersion': facts['device_version']}
+
 
+def write_devices_yaml(device_list, filename=None):
+    """
+    Replace device.yaml atomically, readers never see a half written file.
+
+    :Args:
+     - device_list: Device parameters, LIST TYPE.
+     - filename: Target file, default data/device.yaml.
+    """
+    filename = filename or os.path.join(parameters.BASE_DIR, 'data', 'device.yaml')
+    handle, temp_name = tempfile.mkstemp(dir=os.path.dirname(filename), prefix='.device.', suffix='.yaml')
+    try:
+        with os.fdopen(handle, 'w') as f:
+            yaml.dump(device_list, f)
+        os.replace(temp_name, filename)
+    except Exception:
+        os.remove(temp_name)
+        raise
+
+
+def save_devices_yaml(max_workers=MAX_WORKERS, timeout=PROBE_TIMEOUT):
+    """
+    The test device information is saved to yaml, all devices are probed in parallel.
+
+    :Args:
+     - max_workers: Devices probed at the same time, INT TYPE.
+     - timeout: Seconds each device may take, devices that don't answer are skipped.
+
+    :Usage:
+        save_devices_yaml()
+    """
+    devices = get_android_devices()
     device_list = []
-    for device in get_android_devices():
-        cmd = adb.Adb(device)
-        device_list.append(
-            {'deviceName': device, 'platformName':
-                'Android', 'platformVersion': cmd.device_version()})
-        logger.Logger().get_logger(
-            'Get the android device is {0}, android version is {1}'.format(
-                device, cmd.device_version()))
-
-    with open(parameters.make_directory('data/device.yaml', 0), 'w') as f:
-        yaml.dump(device_list, f)
+    if devices:
+        with futures.ThreadPoolExecutor(max_workers=min(max_workers, len(devices))) as executor:
+            probes = [(device, executor.submit(probe_device, device, timeout)) for device in devices]
+            for device, probe in probes:
+                try:
+                    parameter = probe.result()
+                except Exception as error:
+                    logger.Logger().get_logger(
+                        'Failed to get the android device {0}: {1!r}'.format(device, error), 'ERROR')
+                    continue
+                device_list.append(parameter)
+                logger.Logger().get_logger(
+                    'Get the android device is {0}, android version is {1}'.format(
+                        device, parameter['platformVersion']))
+
+    write_devices_yaml(device_list)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  install_devices
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Install or uninstall one build on every connected device in parallel
+# ========================================================
+import collections
+import os
+import threading
+import time
+from concurrent import futures
+from public.utils import adb, adb_parser
+from public.common import logger
+from public.common.get_devices import get_android_devices, MAX_WORKERS
+
+# Apk uploads running at the same time, bounds the USB and host bandwidth they share.
+MAX_TRANSFERS = 4
+
+# Outcome of one device: status is 'installed', 'skipped', 'uninstalled' or 'failed'.
+InstallReport = collections.namedtuple('InstallReport', 'serial status seconds message')
+
+
+def _install_device(serial, data, apk_name, package, transfers, timeout):
+    start_time = time.perf_counter()
+    cmd = adb.Adb(serial)
+    try:
+        # The version check is a cheap shell call, only the upload waits for a transfer slot.
+        if package is not None and cmd.get_apk_version(package, apk_name):
+            return InstallReport(serial, 'skipped', time.perf_counter() - start_time, 'Already installed')
+        with transfers:
+            succeeded, message = adb_parser.install_result(cmd.install_stream(data, timeout))
+    except Exception as error:
+        succeeded, message = False, repr(error)
+    return InstallReport(serial, 'installed' if succeeded else 'failed', time.perf_counter() - start_time, message)
+
+
+def _uninstall_device(serial, package):
+    start_time = time.perf_counter()
+    try:
+        cmd = adb.Adb(serial)
+        succeeded, message = adb_parser.install_result(cmd.uninstall(package))
+    except Exception as error:
+        succeeded, message = False, repr(error)
+    return InstallReport(serial, 'uninstalled' if succeeded else 'failed', time.perf_counter() - start_time, message)
+
+
+def _log_reports(reports):
+    for report in reports:
+        logger.Logger().get_logger(
+            'The device {0} {1} in {2:.2f}s: {3}'.format(report.serial, report.status, report.seconds, report.message),
+            'ERROR' if report.status == 'failed' else 'INFO')
+
+
+def install_devices(devices=None, apk=None, package=None, max_transfers=MAX_TRANSFERS, max_workers=MAX_WORKERS,
+                    timeout=adb.INSTALL_TIMEOUT):
+    """
+    Install the apk on many devices at once. The file is read a single time and the
+    same bytes are streamed into 'pm install -S' on every device.
+
+    :Args:
+     - devices: Device serial numbers, default every connected device, LIST TYPE.
+     - apk: Path of the apk, default the get_new_apk() build in adb.APK_DIRECTORY, STR TYPE.
+     - package: App package name, devices already running the apk's version are skipped,
+       None installs everywhere, STR TYPE.
+     - max_transfers: Uploads running at the same time, INT TYPE.
+     - max_workers: Devices handled at the same time, INT TYPE.
+     - timeout: Seconds a single install may take, INT TYPE.
+
+    :Usage:
+        install_devices(package='com.tdh.rpms')
+        -> [InstallReport(serial='596cb85a', status='installed', seconds=8.41, message='Success'), ...]
+    """
+    apk = apk or os.path.join(adb.APK_DIRECTORY, adb.Adb.get_new_apk())
+    with open(apk, 'rb') as f:
+        data = f.read()
+    devices = get_android_devices() if devices is None else devices
+    if not devices:
+        return []
+
+    transfers = threading.BoundedSemaphore(max_transfers)
+    with futures.ThreadPoolExecutor(max_workers=min(max_workers, len(devices))) as executor:
+        reports = list(executor.map(
+            lambda serial: _install_device(serial, data, os.path.basename(apk), package, transfers, timeout), devices))
+    _log_reports(reports)
+    return reports
+
+
+def uninstall_devices(package, devices=None, max_workers=MAX_WORKERS):
+    """
+    Uninstall the package from many devices at once.
+
+    :Args:
+     - package: App package name, STR TYPE.
+     - devices: Device serial numbers, default every connected device, LIST TYPE.
+     - max_workers: Devices handled at the same time, INT TYPE.
+
+    :Usage:
+        uninstall_devices('com.tdh.rpms')
+    """
+    devices = get_android_devices() if devices is None else devices
+    if not devices:
+        return []
+
+    with futures.ThreadPoolExecutor(max_workers=min(max_workers, len(devices))) as executor:
+        reports = list(executor.map(lambda serial: _uninstall_device(serial, package), devices))
+    _log_reports(reports)
+    return reports
@@ -7,16 +7,23 @@
 # Amended by     :  Null
 # Amend History  :  11/11/2018
 # ========================================================
+import atexit
+import contextlib
+import gzip
+import json
 import os
+import queue
+import re
+import shutil
 import sys
+import threading
+import time
 from termcolor import cprint
 from config import parameters
 from public.utils import time_util
 from public.utils.variables import Variables
 
 
-NOW = time_util.timestamp('format_now')
-
 COLOR_INFO = {
     'default':
         {
@@ -29,46 +36,166 @@ COLOR_INFO = {
         }
 }
 
+# Prefixes of the text log, formatted with the time of each record.
 FORMAT_INFO = {
     'default':
         {
-            'INFO': NOW + ' [INFO] ',
-            'DEBUG': NOW + ' [DEBUG] ',
-            'ERROR': NOW + ' [ERROR] ',
-            'WARN': NOW + ' [WARN] ',
-            'FAIL': NOW + ' [FAIL] ',
-            'SUCCESS': NOW + ' [SUCCESS] '
+            'INFO': '{0} [INFO] ',
+            'DEBUG': '{0} [DEBUG] ',
+            'ERROR': '{0} [ERROR] ',
+            'WARN': '{0} [WARN] ',
+            'FAIL': '{0} [FAIL] ',
+            'SUCCESS': '{0} [SUCCESS] '
         }
 }
 
 
+# Records written per flush, and seconds the writer waits for more before flushing a partial batch.
+BATCH_SIZE = 512
+
+FLUSH_INTERVAL = 0.2
+
+# Every device also gets a JSON-lines stream next to the text log, <serial>.jsonl, rotated
+# once it reaches STREAM_MAX_BYTES into <serial>.jsonl.1 ... .STREAM_BACKUPS, gzip
+# compressed when STREAM_COMPRESS is set.
+STREAM_MAX_BYTES = 64 * 1024 * 1024
+
+STREAM_BACKUPS = 10
+
+STREAM_COMPRESS = False
+
+# The action duration BasePage puts in its messages: "..., Spend 0.52 seconds".
+SPEND_PATTERN = re.compile(r'Spend (\d+(?:\.\d+)?) seconds')
+
+# Fields log_context() adds to the structured records of the current thread.
+_context = threading.local()
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """
+    Tag the structured records this thread logs inside the block, nested blocks add to
+    the outer fields.
+
+    :Args:
+     - fields: Record fields, such as device='596cb85a' or case='test_login'.
+
+    :Usage:
+        with log_context(device='596cb85a', case='test_login'):
+            page.click(*locator)
+    """
+    previous = getattr(_context, 'fields', {})
+    _context.fields = dict(previous, **fields)
+    try:
+        yield _context.fields
+    finally:
+        _context.fields = previous
+
+
+class RecordStream(object):
+
+    def __init__(self, filename, max_bytes=STREAM_MAX_BYTES, backups=STREAM_BACKUPS, compress=STREAM_COMPRESS):
+        """
+        An append-only JSON-lines file with size based rotation, written by one thread only.
+
+        :Args:
+         - filename: Current file, STR TYPE.
+         - max_bytes: Size that triggers a rotation, 0 never rotates, INT TYPE.
+         - backups: Rotated files kept, INT TYPE.
+         - compress: Gzip the rotated files, BOOLEAN TYPE.
+        """
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+        self.size = 0
+        self.__file = None
+
+    def write(self, line):
+        # json.dumps() escapes to ASCII, so len(line) is the size in bytes.
+        if self.__file is None:
+            self.__file = open(self.filename, 'a', encoding='utf-8')
+            self.size = self.__file.tell()
+        if self.max_bytes and self.size and self.size + len(line) > self.max_bytes:
+            self.rotate()
+            self.__file = open(self.filename, 'a', encoding='utf-8')
+            self.size = 0
+        self.__file.write(line)
+        self.size += len(line)
+
+    def rotate(self):
+        """
+        Move the current file to .1 (.1.gz) and shift the older ones up, dropping the last.
+        """
+        self.close()
+        suffix = '.gz' if self.compress else ''
+        for index in range(self.backups - 1, 0, -1):
+            source = '{0}.{1}{2}'.format(self.filename, index, suffix)
+            if os.path.exists(source):
+                os.replace(source, '{0}.{1}{2}'.format(self.filename, index + 1, suffix))
+        if self.backups <= 0:
+            os.remove(self.filename)
+        elif self.compress:
+            with open(self.filename, 'rb') as source, gzip.open(self.filename + '.1.gz', 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.remove(self.filename)
+        else:
+            os.replace(self.filename, self.filename + '.1')
+
+    def flush(self):
+        if self.__file is not None:
+            self.__file.flush()
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
 class MetaSingleton(type):
 
     __instances = {}
+    __lock = threading.Lock()
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls.__instances:
-            cls.__instances[cls] = super(MetaSingleton, cls).__call__(*args, **kwargs)
+        with cls.__lock:
+            if cls not in cls.__instances:
+                cls.__instances[cls] = super(MetaSingleton, cls).__call__(*args, **kwargs)
             return cls.__instances[cls]
 
 
 class ColourInfo(metaclass=MetaSingleton):
 
-    def __init__(self, filename, mode='a', steam=None, encoding='utf-8', delay=False, count=2):
+    def __init__(self, filename, mode='a', encoding='utf-8', batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 structured=True):
+        """
+        Colour the records on the console and append them to the log file from one
+        background thread: callers only enqueue, the file stays open for the whole run
+        and is flushed once per batch. sys.stdout is never swapped.
+
+        :Args:
+         - filename: Log file, STR TYPE.
+         - batch_size: Records written before the file is flushed, INT TYPE.
+         - flush_interval: Seconds a partial batch may wait before it is flushed, FLOAT TYPE.
+         - structured: Also write every record to the JSON-lines stream of its device, BOOLEAN TYPE.
+        """
         self.filename = os.fspath(filename)
         self.baseFilename = os.path.abspath(filename)
         self.mode = mode
         self.encoding = encoding
-        self.delay = delay
-        if steam is None:
-            self.steam = sys.stderr
-        self.steam = steam
-        self.__console__ = sys.stdout
-        self.count = count
-
-    def __enter__(self):
-        self.openedFile = open(self.filename, self.mode, encoding=self.encoding)
-        return self
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.structured = structured
+        self.__file = None
+        self.__streams = {}
+        # Set by close(): records and flushes are handled in the calling thread from then on.
+        self.__closed = False
+        self.__state_lock = threading.Lock()
+        self.__write_lock = threading.Lock()
+        self.__queue = queue.Queue()
+        self.__thread = threading.Thread(target=self.__write_records, name='logger-writer', daemon=True)
+        self.__thread.start()
+        atexit.register(self.close)
 
     @staticmethod
     def colour(msg, colour):
@@ -77,38 +204,186 @@ class ColourInfo(metaclass=MetaSingleton):
     def show_message(self, level_key=None, msg=None):
         return self.colour(msg, COLOR_INFO['default'][level_key])
 
-    def redirected_output(self, level, msg):
-        for sign in range(1, self.count):
-            # Record the current output pointing to the console by default
-            temp = self.__console__
-            if self.delay:
-                self.steam = None
-            else:
-                with open(self.filename, self.mode, encoding=self.encoding) as file:
-                    # Output to TXT file.
-                    sys.stdout = file
-                    self.show_message(level, msg)
-                # The output is redirected back to the console.
-                sys.stdout = temp
-                self.show_message(level, msg)
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.openedFile.close()
+    def redirected_output(self, level, msg, record=None):
+        """
+        Queue one record, returns at once.
+
+        :Args:
+         - level: COLOR_INFO level, STR TYPE.
+         - msg: Formatted record, STR TYPE.
+         - record: Fields of the structured record, 'device' picks the stream, DICT TYPE.
+        """
+        with self.__state_lock:
+            if not self.__closed:
+                self.__queue.put((level, msg, record))
+                return
+        # Logged by a later exit handler, write it in the calling thread.
+        with self.__write_lock:
+            self.__write(level, msg, record)
+            self.__flush_files()
+
+    def stream_name(self, device):
+        """
+        The JSON-lines file of a device, next to the text log.
+
+        :Args:
+         - device: Device serial number, None for records not tied to a device.
+        """
+        name = re.sub(r'[^\w.-]', '_', device) if device else 'host'
+        return os.path.join(os.path.dirname(self.baseFilename), '{0}.jsonl'.format(name))
+
+    def flush(self, timeout=None):
+        """
+        Block until every record queued so far is on the console and in the files.
+
+        :Usage:
+            ColourInfo(Logger().log_name).flush()
+        """
+        with self.__state_lock:
+            if not self.__closed:
+                done = threading.Event()
+                self.__queue.put(done)
+                return done.wait(timeout)
+        # The writer is stopped or stopping, close() writes and flushes what it left.
+        self.__thread.join(timeout)
+        with self.__write_lock:
+            self.__flush_files()
+        return not self.__thread.is_alive()
+
+    def close(self):
+        with self.__state_lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__queue.put(None)
+        self.__thread.join()
+        with self.__write_lock:
+            # Records and flushes queued before None that the writer did not reach.
+            while not self.__queue.empty():
+                item = self.__queue.get_nowait()
+                if isinstance(item, tuple):
+                    self.__write(*item)
+                elif isinstance(item, threading.Event):
+                    item.set()
+            self.__flush_files()
+
+    def __write(self, level, msg, record):
+        if self.__file is None:
+            self.__file = open(self.filename, self.mode, encoding=self.encoding)
+        self.__file.write(msg + '\n')
+        if record is not None and self.structured:
+            device = record.get('device')
+            stream = self.__streams.get(device)
+            if stream is None:
+                stream = self.__streams[device] = RecordStream(self.stream_name(device))
+            stream.write(json.dumps(record) + '\n')
+        self.show_message(level, msg)
+
+    def __flush_files(self):
+        if self.__file is not None:
+            self.__file.flush()
+        for stream in self.__streams.values():
+            stream.flush()
+
+    def __write_records(self):
+        pending = 0
+        while True:
+            try:
+                item = self.__queue.get(timeout=self.flush_interval if pending else None)
+            except queue.Empty:
+                # Nothing more came in, flush the partial batch.
+                with self.__write_lock:
+                    self.__flush_files()
+                pending = 0
+                continue
+            if item is None or isinstance(item, threading.Event):
+                with self.__write_lock:
+                    self.__flush_files()
+                pending = 0
+                if item is None:
+                    return
+                item.set()
+                continue
+            try:
+                with self.__write_lock:
+                    self.__write(*item)
+            except Exception as error:
+                # The writer thread must outlive a bad record or a full disk.
+                sys.stderr.write('Failed to write the log record {0!r}: {1!r}\n'.format(item[1], error))
+            pending += 1
+            if pending >= self.batch_size:
+                with self.__write_lock:
+                    self.__flush_files()
+                pending = 0
 
 
 class Logger(object):
 
-    def __init__(self):
-        self.log_name = parameters.document_name('log')
+    # The log file is named once per run, not on every Logger().
+    __log_name = None
+
+    def __init__(self, device=None, case=None):
+        """
+        :Args:
+         - device: Device serial number put on the structured records, default the
+           log_context() of the calling thread.
+         - case: Test case id put on the structured records, default the log_context().
+        """
+        if Logger.__log_name is None:
+            Logger.__log_name = parameters.run_layout().path('log')
+        self.log_name = Logger.__log_name
+        self.fields = {key: value for key, value in (('device', device), ('case', case)) if value is not None}
 
     @property
     def __console__(self):
         return ColourInfo(self.log_name)
 
-    def get_logger(self, msg, level_key=None):
+    def record(self, msg, level_key=None, duration=None, **fields):
+        """
+        The structured record of one message: wall clock and monotonic time, level,
+        thread, device, case and the action duration, read from "Spend N seconds"
+        when not given.
+
+        :Args:
+         - msg: Message, STR TYPE.
+         - level_key: COLOR_INFO level, default INFO, STR TYPE.
+         - duration: Seconds the action took, FLOAT TYPE.
+         - fields: Extra record fields.
+        """
+        if duration is None:
+            spend = SPEND_PATTERN.search(msg)
+            duration = float(spend.group(1)) if spend else None
+        record = {
+            'time': time.time(),
+            'monotonic': time.monotonic(),
+            'level': level_key or 'INFO',
+            'device': None,
+            'case': None,
+            'thread': threading.current_thread().name,
+            'duration': duration,
+            'msg': msg,
+        }
+        record.update(getattr(_context, 'fields', {}))
+        record.update(self.fields)
+        record.update(fields)
+        return record
+
+    def get_logger(self, msg, level_key=None, duration=None, **fields):
+        msg = "".join(msg)
+        record = self.record(msg, level_key, duration, **fields)
         if Variables.DEBUG:
             level_key = 'DEBUG'
-        return self.__console__.redirected_output(level_key, FORMAT_INFO['default'][level_key] + "".join(msg))
+        prefix = FORMAT_INFO['default'][level_key].format(time_util.timestamp('format_now'))
+        return self.__console__.redirected_output(level_key, prefix + msg, record)
+
+    def flush(self, timeout=None):
+        """
+        Wait for the background writer to catch up, such as before reading the log file.
+
+        :Usage:
+            Logger().flush()
+        """
+        return self.__console__.flush(timeout)
 
 
 if __name__ == '__main__':
@@ -7,14 +7,27 @@
 # Amended by     :  Null
 # Amend History  :  11/11/2018
 # ========================================================
+import asyncio
+import collections
+import contextlib
 import os
 import time
 import random
 import re
+import shlex
+import signal
 import socket
+import subprocess
 import platform
+import uuid
+import weakref
 from config import parameters
 from public.common import logger
+from public.common.exceptions import AdbConnectionError, AdbTimeoutError
+from public.utils import adb_parser, adb_session
+from public.utils.adb_client import AdbClient, AsyncAdbClient, to_lines
+from public.utils.cache import TTLCache
+from public.utils.wraps import cached, async_cached
 from public.utils.variables import KeyCode
 
 # To determine the system type,
@@ -38,20 +51,404 @@ if 'ANDROID_HOME' in os.environ:
         )
 
 
-class Adb(object):
+# Seconds any adb command may run before it is killed, per Adb instance or per call.
+DEFAULT_TIMEOUT = 120
 
-    def __init__(self, device=None):
+INSTALL_TIMEOUT = 600
+
+# Where the builds under test are dropped, get_new_apk() picks the last one by name.
+APK_DIRECTORY = os.path.join(parameters.BASE_DIR, 'apk')
+
+# Launcher activity of a package, resolved by the package manager on Android 7+.
+RESOLVE_ACTIVITY = 'cmd package resolve-activity --brief -c android.intent.category.LAUNCHER {0}'
+
+# Commands AsyncAdb keeps in flight against one adb server, shared by every device on it.
+HOST_CONCURRENCY = 64
+
+# Spawn the adb binary in its own process group so a timeout kills the
+# whole 'sh -c adb ... | grep ...' pipeline, not only the shell.
+if system == 'Windows':
+    SPAWN_OPTIONS = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    SPAWN_OPTIONS = {'start_new_session': True}
+
+
+def kill_process_tree(process):
+    """
+    Kill a process started with SPAWN_OPTIONS and everything it spawned.
+
+    :Args:
+     - process: subprocess.Popen or asyncio subprocess.
+    """
+    try:
+        if system == 'Windows':
+            subprocess.call('taskkill /F /T /PID {0}'.format(process.pid),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, ProcessLookupError):
+        pass
+
+
+def run_command(command, timeout=None, data=None):
+    """
+    Run a host command line and return its output lines, killing it on timeout.
+
+    :Args:
+     - command: Host shell command line, STR TYPE.
+     - timeout: Seconds, None waits forever.
+     - data: Bytes fed to the command's stdin, BYTES TYPE.
+
+    :Usage:
+        run_command('adb devices', timeout=10)
+    """
+    process = subprocess.Popen(command, shell=True, stdin=None if data is None else subprocess.PIPE,
+                               stdout=subprocess.PIPE, **SPAWN_OPTIONS)
+    try:
+        output, _ = process.communicate(data, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        kill_process_tree(process)
+        process.communicate()
+        raise AdbTimeoutError('`{0}` did not finish in {1} seconds'.format(command, timeout))
+    except BaseException:
+        kill_process_tree(process)
+        process.wait()
+        raise
+    return to_lines(output)
+
+
+def host_quote(command):
+    """
+    Quote a device command line so the host shell hands it to adb as one argument.
+
+    :Args:
+     - command: Shell command line, STR TYPE.
+    """
+    if system == 'Windows':
+        return '"{0}"'.format(command.replace('"', '\\"'))
+    return shlex.quote(command)
+
+
+def _first_line(lines):
+    return lines[0]
+
+
+def _first_line_stripped(lines):
+    return lines[0].strip()
+
+
+def _device_size(lines):
+    return str(lines[0]).split(':')[1].strip()
+
+
+def _device_ip(lines):
+    for value in lines:
+        if 'wlan' in value:
+            return re.findall(r'\d+\.\d+\.\d+\.\d+', value)[0]
+
+
+def _device_network(lines):
+    for network in lines:
+        if 'wlan0' in network:
+            return str(network.split()[2]).split('/')[0]
+
+
+def _devices_connected(lines):
+    if len(lines) > 2:
+        device_name = str(lines[1]).strip('\t\n')[:str(lines[1]).strip('\t\n').find('device')]
+        if device_name is not None:
+            return True
+
+
+def _clear_succeeded(lines):
+    return True if 'Success' in lines[0].strip() else False
+
+
+def _apk_version_matches(lines, new_apk):
+    if not lines or '=' not in lines[0]:
+        # Not installed on the device.
+        return False
+    apk_version = str(lines[0]).split('=')[1].strip('\n')
+    # Only names like app_release_1.2.3.apk carry a version; any other apk is of
+    # unknown version and installed.
+    parts = os.path.basename(new_apk).split('_')
+    if len(parts) < 3:
+        return False
+    now_version = parts[2].replace('.apk', '')
+    return True if apk_version == now_version else False
+
+
+# Device facts read with one shell command each: name -> (command, parser of the output lines).
+# The getters and Adb.batch() share them, so a batched result parses exactly like a single call.
+PROBES = {
+    'device_name': ('getprop ro.serialno', _first_line),
+    'device_version': ('getprop ro.build.version.release', _first_line_stripped),
+    'get_android_id': ('settings get secure android_id', _first_line_stripped),
+    'get_the_device_size': ('wm size', _device_size),
+    'device_ip': ('netcfg', _device_ip),
+    'get_the_current_device_network': ('netcfg', _device_network),
+}
+
+# Facts that don't change while a device stays up, cached per serial until
+# PROPERTY_TTL expires or reboot()/clear_data() invalidates them.
+STATIC_PROPERTIES = (
+    'device_name',
+    'device_version',
+    'get_android_id',
+    'get_device_id',
+    'get_the_device_size',
+)
+
+PROPERTY_TTL = 600
+
+PROPERTY_CACHE = TTLCache(PROPERTY_TTL)
+
+# What Adb.snapshot() collects when registering a device.
+SNAPSHOT_PROBES = (
+    'device_version',
+    'get_android_id',
+    'get_the_device_size',
+    'device_ip',
+    'get_the_current_device_network',
+)
+
+
+class _AdbBase(object):
+
+    def __init__(self, device=None, transport='auto', timeout=DEFAULT_TIMEOUT):
+        """
+        :Args:
+         - device: Device serial number, default the only connected device.
+         - transport: 'auto' talks to the adb server over its socket and falls back to
+           the adb binary when the server is unreachable, 'socket' or 'subprocess' force one.
+         - timeout: Default seconds before a command is killed and AdbTimeoutError raised,
+           None waits forever.
+        """
+        self.serial = device
         if device is not None:
             self.device = '-s {0}'.format(device)
         else:
             self.device = ''
+        self.transport = transport
+        self.timeout = timeout
 
-    def adb_arguments(self, args):
-        return os.popen('adb {0} {1}'.format(self.device, args)).readlines()
+    @property
+    def find_command(self):
+        """
+        The filter command used in shell pipes, the pipe runs on the device unless
+        the adb binary is spawned on the host.
+        """
+        return find_command if self.transport == 'subprocess' else 'grep'
+
+    def _server_request(self, args):
+        # adb client commands that map onto a single adb server request, as
+        # (kind, service, output -> lines); anything else (install, push, ...)
+        # still goes through the adb binary.
+        name, _, rest = args.strip().partition(' ')
+        if name == 'shell':
+            return 'service', 'shell:{0}'.format(rest), to_lines
+        if name == 'devices':
+            return 'query', 'host:devices', lambda data: ['List of devices attached\n'] + to_lines(data) + ['\n']
+        if name in ('get-state', 'get-serialno'):
+            return ('query', self.client.host_prefix(self.serial) + name,
+                    lambda data: [data.decode('utf-8', 'replace') + '\n'])
+        if name == 'reboot':
+            return 'service', 'reboot:{0}'.format(rest), to_lines
+        if name == 'exec-in':
+            return 'service', 'exec:{0}'.format(rest), to_lines
+        if name == 'uninstall':
+            return 'service', 'shell:pm uninstall {0}'.format(rest), to_lines
+        return None
 
-    def shell_arguments(self, args):
-        return os.popen('adb {0} shell {1}'.format(self.device, args)).readlines()
+    @staticmethod
+    def _batch_plan(commands):
+        # -> (distinct remote commands, delimiter pattern, joined script)
+        remote = []
+        for item in commands:
+            command = PROBES[item][0] if item in PROBES else item
+            if command not in remote:
+                remote.append(command)
+
+        token = uuid.uuid4().hex
+        # Matched on the digits of the exit status, so an echoed command line never splits the output.
+        # The bare echo ends output without a trailing newline (printf, an empty getprop), so the
+        # delimiter is always a line of its own; _batch_result drops that newline again.
+        delimiter = re.compile(r'^__ADB_BATCH_{0}__\d+$'.format(token))
+        script = '; '.join('{0}; __status=$?; echo; echo __ADB_BATCH_{1}__$__status'.format(command, token)
+                           for command in remote)
+        return remote, delimiter, script
+
+    def _batch_result(self, commands, plan, output):
+        remote, delimiter, _ = plan
+        outputs, lines = [], []
+        for line in output:
+            if delimiter.match(line.strip()):
+                text = ''.join(lines).replace('\r\n', '\n')
+                outputs.append((text[:-1] if text.endswith('\n') else text).splitlines(True))
+                lines = []
+            else:
+                lines.append(line)
+        output_of = dict(zip(remote, outputs))
+
+        result = collections.OrderedDict()
+        for item in commands:
+            if item in PROBES:
+                command, parser = PROBES[item]
+                try:
+                    result[item] = parser(output_of.get(command, []))
+                except (IndexError, ValueError):
+                    result[item] = None
+            else:
+                result[item] = output_of.get(item, [])
+            if item in STATIC_PROPERTIES and result[item] is not None:
+                PROPERTY_CACHE.put((self.serial, item), result[item])
+        return result
+
+    def _host_command(self, args, quote=False):
+        if quote:
+            name, _, rest = args.strip().partition(' ')
+            args = '{0} {1}'.format(name, host_quote(rest))
+        return 'adb {0} {1}'.format(self.device, args)
+
+
+class Adb(_AdbBase):
+
+    def __init__(self, device=None, transport='auto', timeout=DEFAULT_TIMEOUT):
+        super(Adb, self).__init__(device, transport, timeout)
+        self.client = AdbClient(timeout=timeout)
+        self._session = None
+
+    @property
+    def find_command(self):
+        return find_command if self.transport == 'subprocess' and self._session is None else 'grep'
+
+    def adb_arguments(self, args, quote=False, timeout=None, data=None):
+        """
+        Run an adb client command.
+
+        :Args:
+         - args: adb arguments, such as 'shell wm size', STR TYPE.
+         - quote: Quote everything after the command name for the host shell so pipes and
+           ';' run on the device when the adb binary is used, BOOLEAN TYPE.
+         - timeout: Seconds before the command is killed and AdbTimeoutError raised,
+           default the instance timeout.
+         - data: Bytes fed to the command's stdin, used with 'exec-in', BYTES TYPE.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if self.transport != 'subprocess':
+            request = self._server_request(args)
+            if request is not None:
+                kind, service, lines = request
+                try:
+                    if kind == 'query':
+                        return lines(self.client.query(service, timeout))
+                    return lines(self.client.run_service(self.serial, service, timeout, data))
+                except AdbConnectionError:
+                    if self.transport == 'socket':
+                        raise
+                    # Stick to the adb binary so host side pipes pick the right filter command.
+                    self.transport = 'subprocess'
+        return run_command(self._host_command(args, quote), timeout, data)
+
+    def shell_arguments(self, args, quote=False, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        if self._session is not None:
+            if self._session.closed:
+                # A timed out command tears its shell down, carry on in a fresh one.
+                adb_session.release(self._session)
+                self._session = adb_session.acquire(self)
+            return self._session.run(args, timeout)
+        return self.adb_arguments('shell {0}'.format(args), quote, timeout)
+
+    def probe(self, name):
+        """
+        Read one of the PROBES device facts.
 
+        :Args:
+         - name: PROBES key, STR TYPE.
+
+        :Usage:
+            Adb().probe('device_version')
+        """
+        command, parser = PROBES[name]
+        return parser(self.shell_arguments(command))
+
+    def batch(self, commands):
+        """
+        Run several commands in a single remote shell invocation.
+
+        Every command is followed by an echo of a per-call delimiter and its exit
+        status, and the output is cut back into one slice per command. Commands
+        shared by several probes (device_ip and the network both read netcfg) run once.
+
+        :Args:
+         - commands: PROBES names and/or raw shell commands, LIST TYPE.
+
+        :Returns:
+            An OrderedDict keyed by the items of commands, in the same order:
+             - a PROBES name maps to its parsed value, as the getter of the same name
+               returns it, or None when the command printed nothing it could parse;
+             - a raw shell command maps to its output lines, as shell_arguments returns them.
+
+        :Usage:
+            Adb('596cb85a').batch(['device_version', 'wm density'])
+        """
+        plan = self._batch_plan(commands)
+        return self._batch_result(commands, plan, self.shell_arguments(plan[2], quote=True))
+
+    def snapshot(self):
+        """
+        Collect the SNAPSHOT_PROBES facts used to register a device in one round trip.
+
+        :Usage:
+            Adb('596cb85a').snapshot()
+            -> OrderedDict([('device_version', '5.1.1'), ('get_android_id', '8f2c1e4d5a6b7c8d'), ...])
+        """
+        return self.batch(SNAPSHOT_PROBES)
+
+    @staticmethod
+    def cache_stats():
+        """
+        Hit/miss counters of the device property cache.
+
+        :Usage:
+            Adb.cache_stats()
+            -> {'hits': 118, 'misses': 5, 'size': 5}
+        """
+        return PROPERTY_CACHE.stats()
+
+    def invalidate_cache(self):
+        """
+        Forget the cached properties of this device.
+
+        :Usage:
+            Adb('596cb85a').invalidate_cache()
+        """
+        PROPERTY_CACHE.invalidate(self.serial)
+
+    @contextlib.contextmanager
+    def session(self):
+        """
+        Run every shell command of the block through one long-lived adb shell of the
+        device instead of a new shell per call. Nested and concurrent sessions of the
+        same device share that shell.
+
+        :Usage:
+            with Adb('596cb85a').session() as device:
+                device.get_uid('com.tdh.rpms')
+                device.device_ip()
+        """
+        if self._session is not None:
+            yield self
+            return
+        self._session = adb_session.acquire(self)
+        try:
+            yield self
+        finally:
+            session, self._session = self._session, None
+            adb_session.release(session)
+
+    @cached(PROPERTY_CACHE, lambda adb: adb.serial)
     def device_name(self):
         """
         Get device name
@@ -59,8 +456,9 @@ class Adb(object):
         :Usage:
             Adb().device_name()
         """
-        return self.shell_arguments('getprop ro.serialno')[0]
+        return self.probe('device_name')
 
+    @cached(PROPERTY_CACHE, lambda adb: adb.serial)
     def device_version(self):
         """
         Get the device version number.
@@ -68,8 +466,32 @@ class Adb(object):
         :Usage:
             device_version()
         """
-        return self.shell_arguments('getprop ro.build.version.release')[0].strip()
+        return self.probe('device_version')
+
+    def packages(self, keyword=''):
+        """
+        Installed packages as Package records, filtered on the device by pm.
+
+        :Args:
+         - keyword: Substring of the package name, default all packages, STR TYPE.
+
+        :Usage:
+            Adb().packages('rpms') -> [Package(name='com.tdh.rpms', path=None)]
+        """
+        return adb_parser.packages(self.shell_arguments('pm list packages {0}'.format(keyword).strip()))
+
+    @cached(PROPERTY_CACHE, lambda adb: adb.serial)
+    def package_index(self):
+        """
+        Names of all installed packages, read once per device and cached until
+        install_apk/uninstall or PROPERTY_TTL, so membership tests are O(1).
+
+        :Usage:
+            'com.tdh.rpms' in Adb().package_index()
+        """
+        return frozenset(package.name for package in self.packages())
 
+    @cached(PROPERTY_CACHE, lambda adb: adb.serial)
     def resolved_package(self, keyword):
         """
         Gets the application name to be tested.
@@ -80,10 +502,8 @@ class Adb(object):
         :Usage:
             Adb().resolved_package('rpms')
         """
-        package_list = self.shell_arguments('pm list packages')
-        for index, value in enumerate(package_list):
-            if str(package_list[index]).find(keyword) != -1:
-                return str(value).split(':')[1]
+        packages = self.packages(keyword)
+        return packages[0].name if packages else None
 
     def install_apk(self, apk_name):
         """
@@ -94,7 +514,8 @@ class Adb(object):
         :Usage:
             Adb().install_apk(apk_name)
         """
-        self.adb_arguments('install {0}'.format(apk_name))
+        self.invalidate_cache()
+        self.adb_arguments('install {0}'.format(apk_name), timeout=INSTALL_TIMEOUT)
 
     def is_install(self, apk_name):
         """
@@ -106,7 +527,8 @@ class Adb(object):
         :Usage:
             Adb().is_install(apk_name)
         """
-        return True if self.resolved_package(apk_name) else False
+        index = self.package_index()
+        return apk_name in index or any(apk_name in name for name in index)
 
     def uninstall(self, apk_name):
         """
@@ -118,7 +540,26 @@ class Adb(object):
         :Usage：
             Adb().uninstall(apk_name)
         """
-        self.adb_arguments('unintsall {0}'.format(apk_name))
+        self.invalidate_cache()
+        return self.adb_arguments('uninstall {0}'.format(apk_name))
+
+    def install_stream(self, data, timeout=None):
+        """
+        Install an apk already read into memory: the bytes are streamed straight into
+        'pm install -S' on the device, nothing is written to the host or device disk first.
+        Used by install_devices to send one read of the file to many devices.
+
+        :Args:
+         - data: The apk file content, BYTES TYPE.
+         - timeout: Seconds, default INSTALL_TIMEOUT.
+
+        :Usage:
+            Adb('596cb85a').install_stream(open('app.apk', 'rb').read())
+            -> ['Success\n']
+        """
+        self.invalidate_cache()
+        timeout = INSTALL_TIMEOUT if timeout is None else timeout
+        return self.adb_arguments('exec-in pm install -r -S {0}'.format(len(data)), timeout=timeout, data=data)
 
     def get_activity(self, package):
         """
@@ -130,10 +571,25 @@ class Adb(object):
         :Usage:
             Adb().get_activity('com.tdh.rpms')
         """
-        context = self.shell_arguments('dumpsys package {0}'.format(package))
-        for index, value in enumerate(context):
-            if 'SplashActivity' in context[index]:
-                return str(value.strip()).split()[1].replace('/', '')
+        activity = self.resolve_activity(package)
+        return activity.qualified_name if activity else None
+
+    @cached(PROPERTY_CACHE, lambda adb: adb.serial)
+    def resolve_activity(self, package):
+        """
+        The launcher Activity record of a package, asked from the package manager and
+        falling back to the SplashActivity of 'dumpsys package' on devices without 'cmd'.
+
+        :Args:
+         - package: The app package name, STR TYPE.
+
+        :Usage:
+            Adb().resolve_activity('com.tdh.rpms') -> Activity(package='com.tdh.rpms', name='.SplashActivity')
+        """
+        activity = adb_parser.resolved_activity(self.shell_arguments(RESOLVE_ACTIVITY.format(package)))
+        if activity is None:
+            activity = adb_parser.splash_activity(self.shell_arguments('dumpsys package {0}'.format(package)))
+        return activity
 
     def check_devices(self):
         """
@@ -142,11 +598,7 @@ class Adb(object):
         :Usage:
             Adb().check_devices()
         """
-        connect_status = self.adb_arguments('devices')
-        if len(connect_status) > 2:
-            device_name = str(connect_status[1]).strip('\t\n')[:str(connect_status[1]).strip('\t\n').find('device')]
-            if device_name is not None:
-                return True
+        return _devices_connected(self.adb_arguments('devices'))
 
     def device_ip(self):
         """
@@ -155,12 +607,7 @@ class Adb(object):
         :Usage:
             Adb().device_ip()
         """
-        device_ip = self.shell_arguments('netcfg')
-        for index, value in enumerate(device_ip):
-            if 'wlan' in device_ip[index]:
-                pattern = re.compile(r'\d+\.\d+\.\d+\.\d+')
-                match = re.findall(pattern, value)
-                return match[0]
+        return self.probe('device_ip')
 
     def clear_data(self, package):
         """
@@ -172,7 +619,8 @@ class Adb(object):
         :Usage:
             Adb().clear_data('com.thd.rpms')
         """
-        return True if 'Success' in self.shell_arguments('pm clear {0}'.format(package))[0].strip() else False
+        self.invalidate_cache()
+        return _clear_succeeded(self.shell_arguments('pm clear {0}'.format(package)))
 
     def device_status(self):
         """
@@ -194,6 +642,7 @@ class Adb(object):
         :Usage:
             Adb().reboot()
         """
+        self.invalidate_cache()
         self.adb_arguments('reboot')
 
     @staticmethod
@@ -205,7 +654,7 @@ class Adb(object):
             Adb().get_new_apk()
         """
         try:
-            apk_dir = os.listdir(parameters.document_name('apk'))
+            apk_dir = os.listdir(APK_DIRECTORY)
             if len(apk_dir) == 0:
                 logger.Logger().get_logger('Everything in the the document!', 'ERROR')
             apk_dir.sort()
@@ -213,20 +662,19 @@ class Adb(object):
         except FileNotFoundError as error:
             logger.Logger().get_logger('The FileNotFoundError is {0}!'.format(error))
 
-    def get_apk_version(self, apk):
+    def get_apk_version(self, apk, new_apk=None):
         """
         Get the apk version
 
         :Args:
          - apk: Apk package name, STR TYPE.
+         - new_apk: Apk file name carrying the expected version, default get_new_apk(), STR TYPE.
 
         :Usage:
             Adb().get_apk_version()
         """
-        version_name = self.shell_arguments('dumpsys package {0} | {1} "versionName"'.format(apk, find_command))
-        apk_version = str(version_name[0]).split('=')[1].strip('\n')
-        now_version = str(self.get_new_apk().split('_')[2]).replace('.apk', '')
-        return True if apk_version == now_version else False
+        version_name = self.shell_arguments('dumpsys package {0} | {1} "versionName"'.format(apk, self.find_command))
+        return _apk_version_matches(version_name, new_apk or self.get_new_apk())
 
     def get_apk_size(self):
         """
@@ -235,10 +683,11 @@ class Adb(object):
         :Usage:
             Adb().get_apk_size()
         """
-        apk_size = os.path.getsize(os.path.join(parameters.document_name('apk'), self.get_new_apk()))/(1024*1024)
+        apk_size = os.path.getsize(os.path.join(APK_DIRECTORY, self.get_new_apk()))/(1024*1024)
         logger.Logger().get_logger('The apk size is {0}MB'.format(apk_size))
         return round(apk_size, 2)
 
+    @cached(PROPERTY_CACHE, lambda adb: adb.serial)
     def get_android_id(self):
         """
         Get android_id
@@ -246,8 +695,9 @@ class Adb(object):
         :Usage:
             Adb().get_android_id()
         """
-        return self.shell_arguments('settings get secure android_id')[0].strip()
+        return self.probe('get_android_id')
 
+    @cached(PROPERTY_CACHE, lambda adb: adb.serial)
     def get_device_id(self):
         """
         Get device id
@@ -267,8 +717,22 @@ class Adb(object):
         :Usage:
             Adb().get_pid('com.tdh.rpms')
         """
-        content = self.shell_arguments('ps | {0} {1}'.format(find_command, apk_name))
-        return str(content[0]).split()[1]
+        pids = adb_parser.pids(self.shell_arguments('pidof {0}'.format(apk_name)))
+        if pids:
+            return str(pids[0])
+        return str(self.processes(apk_name)[0].pid)
+
+    def processes(self, keyword):
+        """
+        Process records whose 'ps' line contains keyword, filtered on the device.
+
+        :Args:
+         - keyword: Process name or part of it, STR TYPE.
+
+        :Usage:
+            Adb().processes('com.tdh.rpms') -> [Process(user='u0_a51', pid=1234, ppid=190, name='com.tdh.rpms')]
+        """
+        return adb_parser.processes(self.shell_arguments('ps | {0} {1}'.format(self.find_command, keyword)))
 
     def get_uid(self, apk_name):
         """
@@ -280,12 +744,9 @@ class Adb(object):
         :Usage:
             Adb().get_uid('com.tdh.rpsm')
         """
-        content, uid = self.shell_arguments('cat /proc/{0}/status'.format(self.get_pid(apk_name))), []
-        for line in content:
-            if 'Uid' in line:
-                uid.append(str(line).split('\t')[1])
-        return uid[0]
+        return adb_parser.uid(self.shell_arguments('cat /proc/{0}/status'.format(self.get_pid(apk_name))))
 
+    @cached(PROPERTY_CACHE, lambda adb: adb.serial)
     def get_the_device_size(self):
         """
         Get the device screen size
@@ -293,8 +754,7 @@ class Adb(object):
         :Usage:
             Adb().get_the_device_size()
         """
-        devices_size = self.shell_arguments('wm size')
-        return str(devices_size[0]).split(':')[1].strip()
+        return self.probe('get_the_device_size')
 
     def get_the_current_device_network(self):
         """
@@ -303,10 +763,7 @@ class Adb(object):
         :Usage:
             Adb().get_the_current_device_network()
         """
-        devices_network = self.shell_arguments('netcfg')
-        for network in devices_network:
-            if 'wlan0' in network:
-                return str(network.split()[2]).split('/')[0]
+        return self.probe('get_the_current_device_network')
 
     def input_key_code(self, key_code):
         """
@@ -334,6 +791,230 @@ class Adb(object):
         self.input_key_code(getattr(KeyCode, key))
 
 
+class _AsyncSession(object):
+
+    def __init__(self, adb):
+        self.adb = adb
+
+    async def __aenter__(self):
+        return self.adb
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class AsyncAdb(_AdbBase):
+
+    # Coroutine counterpart of Adb with the same method names: one event loop can
+    # drive many devices, every command is bounded by a timeout, cancelling the task
+    # kills the command and at most HOST_CONCURRENCY commands run per adb server.
+
+    # event loop -> {(host, port): asyncio.Semaphore}
+    _semaphores = weakref.WeakKeyDictionary()
+
+    def __init__(self, device=None, transport='auto', timeout=DEFAULT_TIMEOUT):
+        super(AsyncAdb, self).__init__(device, transport, timeout)
+        self.client = AsyncAdbClient(timeout=timeout)
+
+    def _host_semaphore(self):
+        semaphores = self._semaphores.setdefault(asyncio.get_event_loop(), {})
+        key = (self.client.host, self.client.port)
+        if key not in semaphores:
+            semaphores[key] = asyncio.BoundedSemaphore(HOST_CONCURRENCY)
+        return semaphores[key]
+
+    async def _run_command(self, command, timeout, data=None):
+        process = await asyncio.create_subprocess_shell(
+            command, stdin=None if data is None else subprocess.PIPE, stdout=subprocess.PIPE, **SPAWN_OPTIONS)
+        try:
+            output, _ = await asyncio.wait_for(process.communicate(data), timeout)
+        except asyncio.TimeoutError:
+            kill_process_tree(process)
+            await process.wait()
+            raise AdbTimeoutError('`{0}` did not finish in {1} seconds'.format(command, timeout))
+        except BaseException:
+            kill_process_tree(process)
+            raise
+        return to_lines(output)
+
+    async def adb(self, args, quote=False, timeout=None, data=None):
+        """
+        Coroutine of Adb.adb_arguments().
+
+        :Usage:
+            await AsyncAdb('596cb85a').adb('get-state', timeout=5)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        async with self._host_semaphore():
+            if self.transport != 'subprocess':
+                request = self._server_request(args)
+                if request is not None:
+                    kind, service, lines = request
+                    try:
+                        if kind == 'query':
+                            return lines(await self.client.query_async(service, timeout))
+                        return lines(await self.client.run_service_async(self.serial, service, timeout, data))
+                    except AdbConnectionError:
+                        if self.transport == 'socket':
+                            raise
+                        self.transport = 'subprocess'
+            return await self._run_command(self._host_command(args, quote), timeout, data)
+
+    async def shell(self, args, quote=False, timeout=None):
+        """
+        Coroutine of Adb.shell_arguments().
+
+        :Usage:
+            await AsyncAdb('596cb85a').shell('getprop ro.build.version.release', timeout=5)
+        """
+        return await self.adb('shell {0}'.format(args), quote, timeout)
+
+    # The Adb names of adb() and shell(), so code can be written once for both facades.
+    adb_arguments = adb
+
+    shell_arguments = shell
+
+    def session(self):
+        """
+        Counterpart of Adb.session(). Every AsyncAdb command opens its own connection to
+        the adb server and there is no shell to share, so the block runs as it would
+        without it.
+
+        :Usage:
+            async with AsyncAdb('596cb85a').session() as device:
+                await device.get_uid('com.tdh.rpms')
+        """
+        return _AsyncSession(self)
+
+    cache_stats = staticmethod(Adb.cache_stats)
+
+    async def probe(self, name):
+        command, parser = PROBES[name]
+        return parser(await self.shell(command))
+
+    async def batch(self, commands):
+        """
+        Coroutine of Adb.batch(), same result structure.
+        """
+        plan = self._batch_plan(commands)
+        return self._batch_result(commands, plan, await self.shell(plan[2], quote=True))
+
+    async def snapshot(self):
+        return await self.batch(SNAPSHOT_PROBES)
+
+    def invalidate_cache(self):
+        PROPERTY_CACHE.invalidate(self.serial)
+
+    @async_cached(PROPERTY_CACHE, lambda adb: adb.serial)
+    async def device_name(self):
+        return await self.probe('device_name')
+
+    @async_cached(PROPERTY_CACHE, lambda adb: adb.serial)
+    async def device_version(self):
+        return await self.probe('device_version')
+
+    async def packages(self, keyword=''):
+        return adb_parser.packages(await self.shell('pm list packages {0}'.format(keyword).strip()))
+
+    @async_cached(PROPERTY_CACHE, lambda adb: adb.serial)
+    async def package_index(self):
+        return frozenset(package.name for package in await self.packages())
+
+    @async_cached(PROPERTY_CACHE, lambda adb: adb.serial)
+    async def resolved_package(self, keyword):
+        packages = await self.packages(keyword)
+        return packages[0].name if packages else None
+
+    async def install_apk(self, apk_name):
+        self.invalidate_cache()
+        await self.adb('install {0}'.format(apk_name), timeout=INSTALL_TIMEOUT)
+
+    async def is_install(self, apk_name):
+        index = await self.package_index()
+        return apk_name in index or any(apk_name in name for name in index)
+
+    async def uninstall(self, apk_name):
+        self.invalidate_cache()
+        return await self.adb('uninstall {0}'.format(apk_name))
+
+    async def install_stream(self, data, timeout=None):
+        self.invalidate_cache()
+        timeout = INSTALL_TIMEOUT if timeout is None else timeout
+        return await self.adb('exec-in pm install -r -S {0}'.format(len(data)), timeout=timeout, data=data)
+
+    async def get_activity(self, package):
+        activity = await self.resolve_activity(package)
+        return activity.qualified_name if activity else None
+
+    @async_cached(PROPERTY_CACHE, lambda adb: adb.serial)
+    async def resolve_activity(self, package):
+        activity = adb_parser.resolved_activity(await self.shell(RESOLVE_ACTIVITY.format(package)))
+        if activity is None:
+            activity = adb_parser.splash_activity(await self.shell('dumpsys package {0}'.format(package)))
+        return activity
+
+    async def check_devices(self):
+        return _devices_connected(await self.adb('devices'))
+
+    async def device_ip(self):
+        return await self.probe('device_ip')
+
+    async def clear_data(self, package):
+        self.invalidate_cache()
+        return _clear_succeeded(await self.shell('pm clear {0}'.format(package)))
+
+    async def device_status(self):
+        return (await self.adb('get-state'))[0].strip()
+
+    async def reboot(self):
+        self.invalidate_cache()
+        await self.adb('reboot')
+
+    get_new_apk = staticmethod(Adb.get_new_apk)
+
+    async def get_apk_size(self):
+        # A local file, nothing to await.
+        return Adb.get_apk_size(self)
+
+    async def get_apk_version(self, apk, new_apk=None):
+        version_name = await self.shell('dumpsys package {0} | {1} "versionName"'.format(apk, self.find_command))
+        return _apk_version_matches(version_name, new_apk or self.get_new_apk())
+
+    @async_cached(PROPERTY_CACHE, lambda adb: adb.serial)
+    async def get_android_id(self):
+        return await self.probe('get_android_id')
+
+    @async_cached(PROPERTY_CACHE, lambda adb: adb.serial)
+    async def get_device_id(self):
+        return (await self.adb('get-serialno'))[0].strip()
+
+    async def get_pid(self, apk_name):
+        pids = adb_parser.pids(await self.shell('pidof {0}'.format(apk_name)))
+        if pids:
+            return str(pids[0])
+        return str((await self.processes(apk_name))[0].pid)
+
+    async def processes(self, keyword):
+        return adb_parser.processes(await self.shell('ps | {0} {1}'.format(self.find_command, keyword)))
+
+    async def get_uid(self, apk_name):
+        return adb_parser.uid(await self.shell('cat /proc/{0}/status'.format(await self.get_pid(apk_name))))
+
+    @async_cached(PROPERTY_CACHE, lambda adb: adb.serial)
+    async def get_the_device_size(self):
+        return await self.probe('get_the_device_size')
+
+    async def get_the_current_device_network(self):
+        return await self.probe('get_the_current_device_network')
+
+    async def input_key_code(self, key_code):
+        await self.shell('input keyevent {code}'.format(code=key_code))
+        await asyncio.sleep(0.1)
+
+    async def key_event(self, key):
+        await self.input_key_code(getattr(KeyCode, key))
+
+
 if __name__ == '__main__':
     A = Adb()
     # @staticmethod
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  adb_client
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Speak the adb host protocol to the local adb server
+# ========================================================
+import asyncio
+import os
+import socket
+import time
+from public.common.exceptions import AdbError, AdbConnectionError, AdbTimeoutError
+
+ADB_HOST = '127.0.0.1'
+# Overridden by ANDROID_ADB_SERVER_PORT, the same variable the adb binary honours.
+ADB_PORT = 5037
+
+
+def encode_request(service):
+    """
+    Frame a host request: four hex digits of length followed by the payload.
+
+    :Args:
+     - service: adb service name, STR TYPE.
+
+    :Usage:
+        encode_request('host:version')
+    """
+    payload = service.encode('utf-8')
+    return '{0:04x}'.format(len(payload)).encode('ascii') + payload
+
+
+def to_lines(data):
+    """
+    Split the raw service output the way os.popen(...).readlines() would.
+
+    :Args:
+     - data: Raw service output, BYTES TYPE.
+    """
+    return data.decode('utf-8', 'replace').replace('\r\n', '\n').splitlines(True)
+
+
+class AdbClient(object):
+
+    def __init__(self, host=None, port=None, timeout=None):
+        """
+        :Args:
+         - timeout: Default seconds a whole request may take, None waits forever.
+        """
+        self.host = host or ADB_HOST
+        self.port = int(port or os.environ.get('ANDROID_ADB_SERVER_PORT', ADB_PORT))
+        self.timeout = timeout
+
+    def deadline(self, timeout=None):
+        """
+        Absolute time.monotonic() deadline of a request, None when it has none.
+
+        :Args:
+         - timeout: Seconds, default the client's timeout.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        return None if timeout is None else time.monotonic() + timeout
+
+    @staticmethod
+    def _remaining(deadline):
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise AdbTimeoutError('The adb request timed out')
+        return remaining
+
+    def connect(self, deadline=None):
+        """
+        Open a new connection to the adb server.
+
+        :Usage:
+            AdbClient().connect()
+        """
+        try:
+            sock = socket.create_connection((self.host, self.port), self._remaining(deadline))
+        except OSError as error:
+            raise AdbConnectionError('The adb server {0}:{1} is unreachable: {2}'
+                                     .format(self.host, self.port, error))
+        # Requests are small and latency bound, don't let Nagle hold them back.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _recv(self, sock, size, deadline):
+        if deadline is not None:
+            sock.settimeout(self._remaining(deadline))
+        try:
+            return sock.recv(size)
+        except socket.timeout:
+            raise AdbTimeoutError('The adb request timed out')
+
+    def _read_exactly(self, sock, size, deadline=None):
+        data = b''
+        while len(data) < size:
+            chunk = self._recv(sock, size - len(data), deadline)
+            if not chunk:
+                raise AdbError('The adb server closed the connection unexpectedly')
+            data += chunk
+        return data
+
+    def _read_payload(self, sock, deadline=None):
+        length = int(self._read_exactly(sock, 4, deadline), 16)
+        return self._read_exactly(sock, length, deadline)
+
+    def _read_all(self, sock, deadline=None):
+        chunks = []
+        while True:
+            chunk = self._recv(sock, 65536, deadline)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+
+    def send(self, sock, service, deadline=None):
+        """
+        Send a request and check the OKAY/FAIL status of the reply.
+
+        :Args:
+         - sock: Connected adb server socket.
+         - service: adb service name, STR TYPE.
+         - deadline: time.monotonic() deadline, default none.
+        """
+        sock.sendall(encode_request(service))
+        status = self._read_exactly(sock, 4, deadline)
+        if status == b'OKAY':
+            return sock
+        if status == b'FAIL':
+            raise AdbError(self._read_payload(sock, deadline).decode('utf-8', 'replace'))
+        raise AdbError('Unexpected adb server status {0!r}'.format(status))
+
+    def query(self, service, timeout=None):
+        """
+        Run a host service that answers with a single length-prefixed payload.
+
+        :Args:
+         - service: adb host service, STR TYPE.
+         - timeout: Seconds, default the client's timeout.
+
+        :Usage:
+            AdbClient().query('host:devices')
+        """
+        deadline = self.deadline(timeout)
+        sock = self.connect(deadline)
+        try:
+            self.send(sock, service, deadline)
+            return self._read_payload(sock, deadline)
+        finally:
+            sock.close()
+
+    def open_host(self, service):
+        """
+        Start a streaming host service, such as 'host:track-devices', the caller closes the socket.
+
+        :Args:
+         - service: adb host service, STR TYPE.
+        """
+        sock = self.connect()
+        try:
+            self.send(sock, service)
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+    def read_payload(self, sock):
+        """
+        Read the next length-prefixed message of a streaming host service.
+
+        :Args:
+         - sock: Socket returned by open_host().
+        """
+        return self._read_payload(sock)
+
+    def transport(self, serial=None, deadline=None):
+        """
+        Open a connection already switched to the transport of one device.
+
+        :Args:
+         - serial: Device serial number, None selects the only connected device.
+         - deadline: time.monotonic() deadline, default none.
+        """
+        sock = self.connect(deadline)
+        try:
+            self.send(sock, 'host:transport:{0}'.format(serial) if serial else 'host:transport-any', deadline)
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+    def open_service(self, serial, service, deadline=None):
+        """
+        Start a device service and hand back the streaming socket, the caller closes it.
+
+        :Args:
+         - serial: Device serial number, STR TYPE.
+         - service: Device service, such as 'shell:' or 'exec:cmd', STR TYPE.
+         - deadline: time.monotonic() deadline for opening the service, default none.
+        """
+        sock = self.transport(serial, deadline)
+        try:
+            self.send(sock, service, deadline)
+        except Exception:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        return sock
+
+    def run_service(self, serial, service, timeout=None, data=None):
+        """
+        Run a device service to completion and return everything it printed.
+
+        :Args:
+         - serial: Device serial number, STR TYPE.
+         - service: Device service, STR TYPE.
+         - timeout: Seconds, default the client's timeout. The connection is closed on expiry.
+         - data: Bytes written to the service's stdin, such as an apk for 'exec:pm install -S',
+           BYTES TYPE.
+        """
+        deadline = self.deadline(timeout)
+        sock = self.open_service(serial, service, deadline)
+        try:
+            if data:
+                sock.settimeout(self._remaining(deadline))
+                try:
+                    sock.sendall(data)
+                except socket.timeout:
+                    raise AdbTimeoutError('The adb request timed out')
+            return self._read_all(sock, deadline)
+        finally:
+            sock.close()
+
+    def shell(self, serial, command, timeout=None):
+        """
+        Run a shell command on the device.
+
+        :Args:
+         - serial: Device serial number, STR TYPE.
+         - command: Shell command line, STR TYPE.
+         - timeout: Seconds, default the client's timeout.
+
+        :Usage:
+            AdbClient().shell('596cb85a', 'getprop ro.serialno')
+        """
+        return self.run_service(serial, 'shell:{0}'.format(command), timeout)
+
+    def host_prefix(self, serial=None):
+        return 'host-serial:{0}:'.format(serial) if serial else 'host:'
+
+
+class AsyncAdbClient(AdbClient):
+
+    # The same host protocol over asyncio streams, every coroutine is bounded by
+    # asyncio.wait_for() and closes its connection when it times out or is cancelled.
+
+    async def _connect(self):
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except OSError as error:
+            raise AdbConnectionError('The adb server {0}:{1} is unreachable: {2}'
+                                     .format(self.host, self.port, error))
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return reader, writer
+
+    @staticmethod
+    async def _read_exactly_async(reader, size):
+        try:
+            return await reader.readexactly(size)
+        except asyncio.IncompleteReadError:
+            raise AdbError('The adb server closed the connection unexpectedly')
+
+    async def _send(self, reader, writer, service):
+        writer.write(encode_request(service))
+        status = await self._read_exactly_async(reader, 4)
+        if status == b'OKAY':
+            return
+        if status == b'FAIL':
+            length = int(await self._read_exactly_async(reader, 4), 16)
+            raise AdbError((await self._read_exactly_async(reader, length)).decode('utf-8', 'replace'))
+        raise AdbError('Unexpected adb server status {0!r}'.format(status))
+
+    async def _bounded(self, coroutine, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(coroutine, timeout)
+        except asyncio.TimeoutError:
+            raise AdbTimeoutError('The adb request timed out after {0} seconds'.format(timeout))
+
+    async def _query(self, service):
+        reader, writer = await self._connect()
+        try:
+            await self._send(reader, writer, service)
+            length = int(await self._read_exactly_async(reader, 4), 16)
+            return await self._read_exactly_async(reader, length)
+        finally:
+            writer.close()
+
+    async def _run_service(self, serial, service, data=None):
+        reader, writer = await self._connect()
+        try:
+            await self._send(reader, writer, 'host:transport:{0}'.format(serial) if serial else 'host:transport-any')
+            await self._send(reader, writer, service)
+            if data:
+                writer.write(data)
+                await writer.drain()
+            return await reader.read()
+        finally:
+            writer.close()
+
+    async def query_async(self, service, timeout=None):
+        """
+        Coroutine of AdbClient.query().
+
+        :Usage:
+            await AsyncAdbClient().query_async('host:devices')
+        """
+        return await self._bounded(self._query(service), timeout)
+
+    async def run_service_async(self, serial, service, timeout=None, data=None):
+        """
+        Coroutine of AdbClient.run_service().
+        """
+        return await self._bounded(self._run_service(serial, service, data), timeout)
+
+    async def shell_async(self, serial, command, timeout=None):
+        """
+        Coroutine of AdbClient.shell().
+
+        :Usage:
+            await AsyncAdbClient().shell_async('596cb85a', 'getprop ro.serialno', timeout=5)
+        """
+        return await self.run_service_async(serial, 'shell:{0}'.format(command), timeout)
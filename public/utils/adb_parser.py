@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  adb_parser
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Typed records parsed from pm, ps, pidof and resolve-activity output
+# ========================================================
+import collections
+
+# One line of 'pm list packages [-f]'
+Package = collections.namedtuple('Package', 'name path')
+
+# One line of 'ps'
+Process = collections.namedtuple('Process', 'user pid ppid name')
+
+
+class Activity(collections.namedtuple('Activity', 'package name')):
+
+    # A component as printed by the package manager: package/.Name or package/full.Name
+
+    @property
+    def component(self):
+        return '{0}/{1}'.format(self.package, self.name)
+
+    @property
+    def qualified_name(self):
+        return self.package + self.name if self.name.startswith('.') else self.name
+
+
+def packages(lines):
+    """
+    Parse 'pm list packages [-f] [filter]' output.
+
+    :Args:
+     - lines: Output lines, LIST TYPE.
+
+    :Usage:
+        packages(['package:com.tdh.rpms\n']) -> [Package(name='com.tdh.rpms', path=None)]
+    """
+    records = []
+    for line in lines:
+        line = line.strip()
+        if not line.startswith('package:'):
+            continue
+        line = line[len('package:'):]
+        path = None
+        if '=' in line:
+            # -f prints package:<apk path>=<name>, the path may contain '=' itself.
+            path, _, line = line.rpartition('=')
+        records.append(Package(line, path))
+    return records
+
+
+def processes(lines):
+    """
+    Parse 'ps' output, with or without its header line.
+
+    :Args:
+     - lines: Output lines, LIST TYPE.
+    """
+    records = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 4 or fields[0] == 'USER' or not fields[1].isdigit():
+            continue
+        records.append(Process(fields[0], int(fields[1]), int(fields[2]), fields[-1]))
+    return records
+
+
+def pids(lines):
+    """
+    Parse 'pidof' output, an empty list when the process is not running or pidof is missing.
+
+    :Args:
+     - lines: Output lines, LIST TYPE.
+    """
+    return [int(value) for line in lines for value in line.split() if value.isdigit()]
+
+
+def resolved_activity(lines):
+    """
+    Parse 'cmd package resolve-activity --brief' output, the component is on the last line.
+
+    :Args:
+     - lines: Output lines, LIST TYPE.
+    """
+    for line in reversed(lines):
+        line = line.strip()
+        if '/' in line and ' ' not in line:
+            package, _, name = line.partition('/')
+            return Activity(package, name)
+
+
+def splash_activity(lines):
+    """
+    Find the SplashActivity in 'dumpsys package' output, for devices without 'cmd package'.
+
+    :Args:
+     - lines: Output lines, LIST TYPE.
+    """
+    for line in lines:
+        if 'SplashActivity' in line:
+            fields = line.split()
+            if len(fields) > 1 and '/' in fields[1]:
+                package, _, name = fields[1].partition('/')
+                return Activity(package, name)
+
+
+def uid(lines):
+    """
+    The real uid from /proc/<pid>/status.
+
+    :Args:
+     - lines: Output lines, LIST TYPE.
+    """
+    for line in lines:
+        if line.startswith('Uid'):
+            return line.split('\t')[1]
+    raise IndexError('No Uid line in the process status')
+
+
+def install_result(lines):
+    """
+    (succeeded, message) of 'pm install' or 'adb install' output, message is the
+    'Failure [INSTALL_FAILED_...]' line when it did not succeed.
+
+    :Args:
+     - lines: Output lines, LIST TYPE.
+
+    :Usage:
+        install_result(['Success\n']) -> (True, 'Success')
+    """
+    lines = [line.strip() for line in lines if line.strip()]
+    for line in lines:
+        if line == 'Success':
+            return True, line
+    for line in lines:
+        if line.startswith(('Failure', 'Error')):
+            return False, line
+    return False, lines[-1] if lines else 'No output from the package manager'
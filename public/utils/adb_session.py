@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  adb_session
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  One long-lived adb shell per device, commands framed by sentinels
+# ========================================================
+import re
+import socket
+import subprocess
+import threading
+import uuid
+from public.common.exceptions import AdbError, AdbConnectionError, AdbTimeoutError
+from public.utils.adb_client import to_lines
+
+
+class ShellSession(object):
+
+    def __init__(self, write, read, close, timeout=None):
+        """
+        :Args:
+         - write: Send bytes to the remote shell's stdin.
+         - read: Return the next chunk of the shell's output, b'' once it has exited.
+         - close: Release the underlying process or socket.
+         - timeout: Seconds the shell may take to start, None waits forever.
+        """
+        self.__write = write
+        self.__read = read
+        self.__close = close
+        self.__lock = threading.Lock()
+        self.__buffer = b''
+        # The marker is echoed as "__ADB_""<id>__", so a shell that echoes its
+        # input back (pty mode on old devices) never prints it contiguously.
+        token = uuid.uuid4().hex
+        self.__marker = '__ADB_{0}__'.format(token).encode('ascii')
+        self.__echo_marker = 'echo "__ADB_""{0}__$?"\n'.format(token).encode('ascii')
+        self.__pattern = re.compile(re.escape(self.__marker) + rb'(\d+)\r?\n')
+        self.closed = False
+        self.last_status = None
+        self.references = 0
+        # Silence the prompt and the pty echo, and drain whatever the shell printed on start.
+        self.run('export PS1= PS2=; stty -echo 2>/dev/null', timeout)
+
+    @classmethod
+    def over_socket(cls, client, serial):
+        """
+        Open an interactive 'shell:' service through the adb server.
+
+        :Args:
+         - client: AdbClient connected to the local adb server.
+         - serial: Device serial number, STR TYPE.
+        """
+        sock = client.open_service(serial, 'shell:', client.deadline())
+
+        def close():
+            # shutdown() first, close() alone does not wake a recv() blocked in another thread.
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+        return cls(sock.sendall, lambda: sock.recv(65536), close, client.timeout)
+
+    @classmethod
+    def over_subprocess(cls, serial, timeout=None):
+        """
+        Spawn one 'adb shell' process and keep its pipes open.
+
+        :Args:
+         - serial: Device serial number, STR TYPE.
+         - timeout: Seconds the shell may take to start, None waits forever.
+        """
+        process = subprocess.Popen(['adb'] + (['-s', serial] if serial else []) + ['shell'],
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+        def write(data):
+            process.stdin.write(data)
+            process.stdin.flush()
+
+        def close():
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            process.kill()
+            process.wait()
+
+        return cls(write, lambda: process.stdout.read1(65536), close, timeout)
+
+    def run(self, command, timeout=None):
+        """
+        Run one command in the shell and return its output lines.
+
+        :Args:
+         - command: Shell command line, STR TYPE.
+         - timeout: Seconds, None waits forever. On expiry the shell is torn down, since
+           the command may still be printing, and AdbTimeoutError is raised.
+
+        :Usage:
+            session.run('getprop ro.build.version.release', timeout=10)
+        """
+        with self.__lock:
+            if self.closed:
+                raise AdbError('The adb shell session is closed')
+            watchdog, expired = None, threading.Event()
+            if timeout is not None:
+                watchdog = threading.Timer(timeout, lambda: (expired.set(), self.close()))
+                watchdog.daemon = True
+                watchdog.start()
+            try:
+                self.__write(command.encode('utf-8') + b'\n' + self.__echo_marker)
+                while True:
+                    match = self.__pattern.search(self.__buffer)
+                    if match is not None:
+                        break
+                    chunk = self.__read()
+                    if not chunk:
+                        raise AdbError('The adb shell session exited while running: {0}'.format(command))
+                    self.__buffer += chunk
+            except (OSError, AdbError):
+                self.close()
+                if expired.is_set():
+                    raise AdbTimeoutError('`{0}` did not finish in {1} seconds'.format(command, timeout))
+                raise
+            finally:
+                if watchdog is not None:
+                    watchdog.cancel()
+            output, self.__buffer = self.__buffer[:match.start()], self.__buffer[match.end():]
+            self.last_status = int(match.group(1))
+            return to_lines(output)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.__close()
+
+
+# serial -> ShellSession shared by every Adb of that device
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def acquire(adb):
+    """
+    Get the device's shell session, opening it on first use.
+
+    :Args:
+     - adb: The Adb whose device and transport the session uses.
+    """
+    with _sessions_lock:
+        session = _sessions.get(adb.serial)
+        if session is None or session.closed:
+            session = None
+            if adb.transport != 'subprocess':
+                try:
+                    session = ShellSession.over_socket(adb.client, adb.serial)
+                except AdbConnectionError:
+                    if adb.transport == 'socket':
+                        raise
+            if session is None:
+                session = ShellSession.over_subprocess(adb.serial, adb.timeout)
+            _sessions[adb.serial] = session
+        session.references += 1
+        return session
+
+
+def release(session):
+    """
+    Drop one reference, the shell exits with its last user.
+
+    :Args:
+     - session: ShellSession returned by acquire().
+    """
+    with _sessions_lock:
+        session.references -= 1
+        if session.references <= 0:
+            for serial, value in list(_sessions.items()):
+                if value is session:
+                    del _sessions[serial]
+            session.close()
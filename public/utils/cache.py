@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ========================================================
+# Module         :  cache
+# Author         :  Null
+# Create Date    :  10/18/2026
+# Amended by     :  Null
+# Amend History  :  10/18/2026
+# description    :  Thread safe TTL cache with hit/miss counters
+# ========================================================
+import threading
+import time
+
+
+class TTLCache(object):
+
+    def __init__(self, ttl=None):
+        """
+        :Args:
+         - ttl: Seconds an entry stays valid, None keeps it until invalidated.
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__entries = {}
+        self.__lock = threading.Lock()
+
+    def get(self, key, loader):
+        """
+        Return the cached value of key, calling loader() to fill it on a miss.
+
+        :Args:
+         - key: Cache key, a TUPLE whose first items are used by invalidate().
+         - loader: Computes the value, CALLABLE TYPE.
+
+        :Usage:
+            cache.get(('596cb85a', 'device_version'), adb.device_version)
+        """
+        found, value = self.lookup(key)
+        if found:
+            return value
+        value = loader()
+        self.put(key, value)
+        return value
+
+    def lookup(self, key):
+        """
+        (True, value) for a live entry, (False, None) otherwise, counted as a hit or a miss.
+
+        :Args:
+         - key: Cache key, TUPLE TYPE.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self.__lock:
+            self.__entries[key] = (expires, value)
+
+    def invalidate(self, *prefix):
+        """
+        Drop every entry whose key starts with prefix, no prefix clears the cache.
+
+        :Usage:
+            cache.invalidate('596cb85a')
+        """
+        with self.__lock:
+            for key in [key for key in self.__entries if key[:len(prefix)] == prefix]:
+                del self.__entries[key]
+
+    def stats(self):
+        """
+        Hit/miss counters and the current number of entries.
+        """
+        with self.__lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.__entries)}
@@ -7,3 +7,63 @@
 # Amended by     :  Null
 # Amend History  :  11/11/2018
 # ========================================================
+import functools
+import inspect
+
+
+def _key_function(function, scope):
+    # Arguments are bound to the signature, so device.resolved_package('qq') and
+    # device.resolved_package(keyword='qq') share one entry.
+    signature = inspect.signature(function)
+
+    def key(self, args, kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        return (scope(self), function.__name__) + tuple(list(bound.arguments.items())[1:])
+    return key
+
+
+def cached(cache, scope):
+    """
+    Memoize a method in cache under (scope(self), method name, *arguments), positional
+    and keyword arguments alike.
+
+    :Args:
+     - cache: A public.utils.cache.TTLCache.
+     - scope: Returns the first key item from the instance, such as the device serial.
+
+    :Usage:
+        @cached(PROPERTY_CACHE, lambda adb: adb.serial)
+        def device_version(self): ...
+    """
+    def decorator(function):
+        key = _key_function(function, scope)
+
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            return cache.get(key(self, args, kwargs), lambda: function(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def async_cached(cache, scope):
+    """
+    cached() for coroutine methods, the coroutine only runs on a miss.
+
+    :Usage:
+        @async_cached(PROPERTY_CACHE, lambda adb: adb.serial)
+        async def device_version(self): ...
+    """
+    def decorator(function):
+        key_of = _key_function(function, scope)
+
+        @functools.wraps(function)
+        async def wrapper(self, *args, **kwargs):
+            key = key_of(self, args, kwargs)
+            found, value = cache.lookup(key)
+            if not found:
+                value = await function(self, *args, **kwargs)
+                cache.put(key, value)
+            return value
+        return wrapper
+    return decorator